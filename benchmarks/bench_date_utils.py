@@ -0,0 +1,36 @@
+"""Benchmarks for date_utils.
+
+Run with: uv run python benchmarks/bench_date_utils.py
+"""
+
+import timeit
+from datetime import UTC, datetime, timedelta
+from functools import partial
+
+from mm_std import UtcClock, utc_now
+
+CALLS = 200_000
+
+
+def bench_clock() -> None:
+    """Compare UtcClock readings with datetime.now(UTC), the full-precision baseline."""
+    print(f"clock readings (ns per call, best of 7 x {CALLS})")
+    print(f"{'reading':>28} {'ns':>8} {'vs datetime.now':>16}")
+    seconds = UtcClock(resolution=timedelta(seconds=1))
+    millis = UtcClock(resolution=timedelta(milliseconds=1))
+    full = UtcClock()
+    baseline = 0.0
+    for name, func in (
+        ("datetime.now(UTC)", partial(datetime.now, UTC)),
+        ("utc_now()", utc_now),
+        ("UtcClock(1s).now()", seconds.now),
+        ("UtcClock(1ms).now()", millis.now),
+        ("UtcClock().now_ns()", full.now_ns),
+    ):
+        elapsed = min(timeit.repeat(func, number=CALLS, repeat=7)) / CALLS
+        baseline = baseline or elapsed
+        print(f"{name:>28} {elapsed * 1e9:>8.0f} {baseline / elapsed:>15.2f}x")
+
+
+if __name__ == "__main__":
+    bench_clock()
@@ -0,0 +1,174 @@
+"""Benchmarks for dict_utils.
+
+Run with: uv run python benchmarks/bench_dict_utils.py
+"""
+
+import copy
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+
+from mm_std import (
+    CompiledPath,
+    compact_dict,
+    compact_dict_inplace,
+    compact_dicts,
+    compile_path,
+    deep_merge,
+    flatten,
+    get_path,
+    make_compactor,
+    unflatten,
+)
+
+ROWS = 20_000
+KEYS = 1_000_000
+
+
+def make_records() -> list[dict[str, object]]:
+    """Build API-like records with a few empty values each."""
+    row: dict[str, object] = {
+        "id": 1,
+        "name": "Alice",
+        "email": None,
+        "phone": "",
+        "age": 30,
+        "score": 0,
+        "active": True,
+        "verified": False,
+        "tags": ["a"],
+        "meta": {},
+        "city": "NYC",
+        "zip": None,
+        "balance": Decimal("1.50"),
+        "note": "",
+        "country": "US",
+    }
+    return [dict(row, id=i) for i in range(ROWS)]
+
+
+def bench_compactor() -> None:
+    """Compare per-call compact_dict with a compactor built once and with compact_dicts."""
+    records = make_records()
+    print(f"compact {ROWS} records x 15 fields (ms per pass)")
+    print(f"{'options':>22} {'compact_dict':>13} {'compactor':>10} {'compact_dicts':>14} {'speedup':>8}")
+    for name, options in (
+        ("defaults", {}),
+        ("zero+false as empty", {"treat_zero_as_empty": True, "treat_false_as_empty": True}),
+    ):
+        compact = make_compactor(**options)
+        per_call = min(timeit.repeat(lambda o=options: [compact_dict(r, **o) for r in records], number=3, repeat=7)) / 3
+        compiled = min(timeit.repeat(lambda c=compact: [c(r) for r in records], number=3, repeat=7)) / 3
+        stream = min(timeit.repeat(lambda o=options: list(compact_dicts(records, **o)), number=3, repeat=7)) / 3
+        print(f"{name:>22} {per_call * 1000:>13.2f} {compiled * 1000:>10.2f} {stream * 1000:>14.2f} {per_call / stream:>7.2f}x")
+
+
+def make_large_dict() -> dict[str, object]:
+    """Build one dict with KEYS entries, a tenth of them empty."""
+    return {f"key{i}": None if i % 10 == 0 else i for i in range(KEYS)}
+
+
+def peak_memory(func: Callable[[dict[str, object]], object]) -> tuple[float, float]:
+    """Run func on a fresh large dict; return its peak extra allocation in MiB and its duration in ms."""
+    data = make_large_dict()
+    tracemalloc.start()
+    start = timeit.default_timer()
+    result = func(data)
+    elapsed = timeit.default_timer() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 2**20, elapsed * 1000
+
+
+def bench_inplace() -> None:
+    """Compare the memory of compact_dict with compact_dict_inplace on one large dict."""
+    print(f"compact one dict with {KEYS} keys, 10% empty")
+    print(f"{'function':>22} {'peak MiB':>9} {'ms':>8}")
+    for name, func in (("compact_dict", compact_dict), ("compact_dict_inplace", compact_dict_inplace)):
+        peak, elapsed = peak_memory(func)
+        print(f"{name:>22} {peak:>9.1f} {elapsed:>8.1f}")
+
+
+def naive_flatten(data: object, prefix: str = "") -> dict[str, object]:
+    """Recursive flatten that rebuilds the full key string for every leaf, for comparison."""
+    if isinstance(data, dict) and data:
+        items = data.items()
+    elif isinstance(data, list) and data:
+        items = enumerate(data)
+    else:
+        return {prefix[:-1]: data}
+    result: dict[str, object] = {}
+    for key, value in items:
+        result.update(naive_flatten(value, f"{prefix}{key}."))
+    return result
+
+
+def uncached_get(data: dict[str, object], path: str) -> object:
+    """Parse the path on every call, for comparison with compiled paths."""
+    return CompiledPath(path).get(data)
+
+
+def make_wide_record() -> dict[str, object]:
+    """Build a record with 20 groups of 25 fields and a small list in each group."""
+    return {f"group{g}": {**{f"field{f}": f for f in range(25)}, "items": [{"id": i} for i in range(3)]} for g in range(20)}
+
+
+def bench_paths() -> None:
+    """Compare flatten/unflatten and compiled path access with naive implementations."""
+    records = [make_wide_record() for _ in range(200)]
+    flat = [flatten(r) for r in records]
+    print(f"200 records x {len(flat[0])} leaves (ms per pass)")
+    naive = min(timeit.repeat(lambda: [naive_flatten(r) for r in records], number=3, repeat=5)) / 3
+    fast = min(timeit.repeat(lambda: [flatten(r) for r in records], number=3, repeat=5)) / 3
+    back = min(timeit.repeat(lambda: [unflatten(f) for f in flat], number=3, repeat=5)) / 3
+    print(f"{'naive flatten':>22} {naive * 1000:>9.2f}")
+    print(f"{'flatten':>22} {fast * 1000:>9.2f} {naive / fast:>7.2f}x")
+    print(f"{'unflatten':>22} {back * 1000:>9.2f}")
+
+    path = "group7.items[2].id"
+    compiled = compile_path(path)
+    naive = min(timeit.repeat(lambda: [uncached_get(r, path) for r in records], number=200, repeat=5)) / 200
+    cached = min(timeit.repeat(lambda: [get_path(r, path) for r in records], number=200, repeat=5)) / 200
+    direct = min(timeit.repeat(lambda: [compiled.get(r) for r in records], number=200, repeat=5)) / 200
+    print(f"read {path!r} from 200 records (us per pass)")
+    print(f"{'parse per call':>22} {naive * 1e6:>9.1f}")
+    print(f"{'get_path':>22} {cached * 1e6:>9.1f} {naive / cached:>7.2f}x")
+    print(f"{'CompiledPath.get':>22} {direct * 1e6:>9.1f} {naive / direct:>7.2f}x")
+
+
+def naive_merge(base: dict[str, object], *overrides: dict[str, object]) -> dict[str, object]:
+    """Deep-copy the base, then update it recursively with each override, for comparison."""
+    result = copy.deepcopy(base)
+    for override in overrides:
+        stack = [(result, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))  # type: ignore[arg-type]
+                else:
+                    target[key] = copy.deepcopy(value)
+    return result
+
+
+def bench_merge() -> None:
+    """Layer small overlays on a large config, as a service would per request."""
+    base: dict[str, object] = {f"section{s}": {f"key{k}": {"value": k, "tags": ["a", "b"]} for k in range(50)} for s in range(20)}
+    overlays = [{f"section{i % 20}": {f"key{i}": {"value": -i}}, "feature": {f"flag{i}": True}} for i in range(30)]
+    print(f"merge 30 overlays into a config with {20 * 50} entries (us per merge)")
+    naive = min(timeit.repeat(lambda: naive_merge(base, *overlays), number=20, repeat=5)) / 20
+    fast = min(timeit.repeat(lambda: deep_merge(base, *overlays), number=20, repeat=5)) / 20
+    print(f"{'deepcopy + update':>22} {naive * 1e6:>9.1f}")
+    print(f"{'deep_merge':>22} {fast * 1e6:>9.1f} {naive / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    bench_compactor()
+    print()
+    bench_inplace()
+    print()
+    bench_paths()
+    print()
+    bench_merge()
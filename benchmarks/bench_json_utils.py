@@ -0,0 +1,147 @@
+"""Benchmarks for json_utils.
+
+Run with: uv run python benchmarks/bench_json_utils.py
+"""
+
+import json
+import timeit
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pydantic
+
+from mm_std import ExtendedJSONEncoder, json_dumps
+
+ROWS = 2_000
+
+
+def make_payload(extended_share: float, float_value: float | None = 1.5) -> list[dict[str, object]]:
+    """Build records where about extended_share of the values are non-native types; None puts ints in place of floats."""
+    extended_fields = round(10 * extended_share)
+    row: dict[str, object] = {}
+    for i in range(10):
+        if i < extended_fields:
+            row[f"f{i}"] = (Decimal("19.99"), UUID(int=i), datetime(2024, 1, 15, tzinfo=UTC))[i % 3]
+        else:
+            row[f"f{i}"] = ("text", 42, 7 if float_value is None else float_value)[i % 3]
+    return [dict(row) for _ in range(ROWS)]
+
+
+def bench_modes() -> None:
+    """Compare json_dumps default and precompute modes across shares of extended types.
+
+    Locally precompute is slower on mostly native payloads (about 0.7x at 0%) and only reaches parity,
+    within noise, when most values are extended types; there is no reliable crossover.
+    """
+    print(f"json_dumps, {ROWS} records x 10 fields (ms per call)")
+    print(f"{'extended':>9} {'default':>9} {'precompute':>11} {'speedup':>8}")
+    for share in (0.0, 0.1, 0.2, 0.3, 0.5, 1.0):
+        payload = make_payload(share)
+        default = min(timeit.repeat(lambda p=payload: json_dumps(p), number=5, repeat=9)) / 5
+        precompute = min(timeit.repeat(lambda p=payload: json_dumps(p, mode="precompute"), number=5, repeat=9)) / 5
+        print(f"{share:>9.0%} {default * 1000:>9.2f} {precompute * 1000:>11.2f} {default / precompute:>7.2f}x")
+
+
+@dataclass(slots=True)
+class Line:
+    """Benchmark dataclass leaf."""
+
+    sku: str
+    quantity: int
+    price: Decimal
+    tags: list[str]
+
+
+@dataclass(slots=True)
+class Order:
+    """Benchmark dataclass with nested dataclasses."""
+
+    id: UUID
+    created: datetime
+    lines: list[Line]
+    notes: dict[str, str]
+
+
+class AsdictEncoder(ExtendedJSONEncoder):
+    """The previous dataclass strategy: deep-copy through dataclasses.asdict."""
+
+    def default(self, o: object) -> object:
+        """Encode dataclasses via asdict, everything else as ExtendedJSONEncoder does."""
+        if is_dataclass(o) and not isinstance(o, type):
+            return asdict(o)
+        return super().default(o)
+
+
+def bench_dataclasses() -> None:
+    """Compare compiled dataclass field accessors with dataclasses.asdict."""
+    orders = [
+        Order(
+            id=UUID(int=i),
+            created=datetime(2024, 1, 15, tzinfo=UTC),
+            lines=[Line(sku=f"sku-{j}", quantity=j, price=Decimal("9.99"), tags=["a", "b"]) for j in range(5)],
+            notes={"source": "web"},
+        )
+        for i in range(ROWS)
+    ]
+    asdict_time = min(timeit.repeat(lambda: json.dumps(orders, cls=AsdictEncoder), number=5, repeat=9)) / 5
+    fields_time = min(timeit.repeat(lambda: json_dumps(orders), number=5, repeat=9)) / 5
+    print(f"dataclasses, {ROWS} orders x 5 lines (ms per call)")
+    print(f"asdict: {asdict_time * 1000:.2f}  fields: {fields_time * 1000:.2f}  speedup: {asdict_time / fields_time:.2f}x")
+
+
+def bench_backends() -> None:
+    """Compare the json module with the orjson backend, when orjson is installed.
+
+    Payloads are scanned for floats orjson formats differently (NaN, infinity, exponent form);
+    those are encoded by the json module and pay the scan on top, ordinary floats still use orjson.
+    """
+    options = {"ensure_ascii": False, "separators": (",", ":")}
+    print(f"backends, {ROWS} records x 10 fields (ms per call)")
+    print(f"{'floats':>9} {'extended':>9} {'stdlib':>9} {'auto':>9} {'speedup':>8}")
+    for float_name, float_value in (("none", None), ("1.5", 1.5), ("1e-05", 1e-05)):
+        for share in (0.0, 0.3, 1.0):
+            payload = make_payload(share, float_value)
+            stdlib = min(timeit.repeat(lambda p=payload: json_dumps(p, **options), number=5, repeat=9)) / 5
+            auto = min(timeit.repeat(lambda p=payload: json_dumps(p, backend="auto", **options), number=5, repeat=9)) / 5
+            print(f"{float_name:>9} {share:>9.0%} {stdlib * 1000:>9.2f} {auto * 1000:>9.2f} {stdlib / auto:>7.2f}x")
+
+
+class LineModel(pydantic.BaseModel):
+    """Benchmark pydantic model leaf."""
+
+    sku: str
+    quantity: int
+    price: Decimal
+
+
+class OrderModel(pydantic.BaseModel):
+    """Benchmark pydantic model with nested models."""
+
+    id: UUID
+    created: datetime
+    lines: list[LineModel]
+
+
+def bench_pydantic() -> None:
+    """Compare pydantic_mode="python" (model_dump + encoder callbacks) with pydantic_mode="json"."""
+    orders = [
+        OrderModel(
+            id=UUID(int=i),
+            created=datetime(2024, 1, 15),
+            lines=[LineModel(sku=f"sku-{j}", quantity=j, price=Decimal("9.99")) for j in range(5)],
+        )
+        for i in range(ROWS)
+    ]
+    python = min(timeit.repeat(lambda: json_dumps(orders), number=5, repeat=9)) / 5
+    native = min(timeit.repeat(lambda: json_dumps(orders, pydantic_mode="json"), number=5, repeat=9)) / 5
+    print(f"pydantic, {ROWS} orders x 5 lines (ms per call)")
+    print(f"python: {python * 1000:.2f}  json: {native * 1000:.2f}  speedup: {python / native:.2f}x")
+
+
+if __name__ == "__main__":
+    bench_modes()
+    bench_dataclasses()
+    bench_backends()
+    bench_pydantic()
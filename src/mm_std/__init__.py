@@ -1,12 +1,45 @@
 """mm-std: Python utilities for common data manipulation tasks."""
 
+from .date_utils import DateTimeParser as DateTimeParser
+from .date_utils import UtcClock as UtcClock
+from .date_utils import ceil_datetime as ceil_datetime
+from .date_utils import ceil_epoch as ceil_epoch
+from .date_utils import floor_datetime as floor_datetime
+from .date_utils import floor_epoch as floor_epoch
 from .date_utils import parse_datetime as parse_datetime
+from .date_utils import parse_datetimes as parse_datetimes
+from .date_utils import sliding_windows as sliding_windows
+from .date_utils import tumbling_windows as tumbling_windows
+from .date_utils import utc_from_epoch as utc_from_epoch
+from .date_utils import utc_from_epochs as utc_from_epochs
 from .date_utils import utc_from_timestamp as utc_from_timestamp
 from .date_utils import utc_now as utc_now
 from .date_utils import utc_now_offset as utc_now_offset
+from .date_utils import utc_to_epoch as utc_to_epoch
+from .date_utils import utc_to_epochs as utc_to_epochs
+from .dict_utils import CompiledPath as CompiledPath
+from .dict_utils import DictCompactor as DictCompactor
 from .dict_utils import compact_dict as compact_dict
+from .dict_utils import compact_dict_inplace as compact_dict_inplace
+from .dict_utils import compact_dicts as compact_dicts
+from .dict_utils import compile_path as compile_path
+from .dict_utils import deep_compact as deep_compact
+from .dict_utils import deep_merge as deep_merge
+from .dict_utils import flatten as flatten
+from .dict_utils import get_path as get_path
+from .dict_utils import iter_flatten as iter_flatten
+from .dict_utils import make_compactor as make_compactor
+from .dict_utils import set_path as set_path
+from .dict_utils import unflatten as unflatten
+from .json_utils import ExtendedJSONDecoder as ExtendedJSONDecoder
 from .json_utils import ExtendedJSONEncoder as ExtendedJSONEncoder
+from .json_utils import iter_json_chunks as iter_json_chunks
+from .json_utils import iter_json_lines as iter_json_lines
+from .json_utils import json_dump_lines as json_dump_lines
+from .json_utils import json_dump_stream as json_dump_stream
 from .json_utils import json_dumps as json_dumps
+from .json_utils import json_dumps_bytes as json_dumps_bytes
+from .json_utils import json_loads as json_loads
 from .random_utils import random_datetime as random_datetime
 from .random_utils import random_datetime_offset as random_datetime_offset
 from .random_utils import random_decimal as random_decimal
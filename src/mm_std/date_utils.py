@@ -1,6 +1,23 @@
 """UTC-focused datetime operations and flexible date parsing."""
 
+import time
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Literal, NamedTuple, TypeVar, overload
+
+T = TypeVar("T")
+
+OnError = Literal["raise", "none", "collect"]
+EpochUnit = Literal["s", "ms", "us", "ns"]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_UNIT_NS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
 
 
 def utc_now() -> datetime:
@@ -15,16 +32,66 @@ def utc_now_offset(
 
     Use negative values to get time in the past.
     """
-    params = {}
-    if days is not None:
-        params["days"] = days
-    if hours is not None:
-        params["hours"] = hours
-    if minutes is not None:
-        params["minutes"] = minutes
-    if seconds is not None:
-        params["seconds"] = seconds
-    return datetime.now(UTC) + timedelta(**params)
+    return datetime.now(UTC) + timedelta(days=days or 0, hours=hours or 0, minutes=minutes or 0, seconds=seconds or 0)
+
+
+class UtcClock:
+    """Low-overhead UTC clock for hot loops such as per-request TTL checks.
+
+    Wall time is derived from time.monotonic_ns plus an offset captured at creation,
+    so readings never jump backwards when the system clock is adjusted, but may drift from it;
+    call resync() periodically if that matters.
+    now_ns() returns integer epochs without creating datetimes. now() needs a resolution: readings
+    are truncated to its multiples and the same cached datetime is returned until the next tick.
+    Building a full-precision datetime in Python costs more than datetime.now(UTC), so use
+    utc_now() when a full-precision datetime is needed; see benchmarks/bench_date_utils.py.
+    """
+
+    def __init__(self, resolution: timedelta | None = None) -> None:
+        """Create a clock.
+
+        Args:
+            resolution: Truncate readings to multiples of this interval, None for full precision (now_ns() only)
+
+        Raises:
+            ValueError: If resolution is not positive
+
+        """
+        if resolution is not None and resolution <= timedelta(0):
+            raise ValueError("resolution must be positive")
+        self.resolution = resolution
+        self._resolution_ns = resolution // timedelta(microseconds=1) * 1000 if resolution is not None else 1
+        self._offset_ns = 0
+        self._cached_ns = -1
+        self._cached_dt = _EPOCH
+        self.resync()
+
+    def resync(self) -> None:
+        """Re-anchor the clock to the current system time."""
+        self._offset_ns = time.time_ns() - time.monotonic_ns()
+
+    def now_ns(self) -> int:
+        """Get current UTC time as nanoseconds since the Unix epoch."""
+        ns = time.monotonic_ns() + self._offset_ns
+        return ns - ns % self._resolution_ns
+
+    def now(self) -> datetime:
+        """Get current UTC time truncated to the resolution, cached until the next tick.
+
+        Raises:
+            ValueError: If the clock was created without a resolution
+
+        """
+        ns = time.monotonic_ns() + self._offset_ns
+        ns -= ns % self._resolution_ns
+        if ns == self._cached_ns:
+            return self._cached_dt
+        if self.resolution is None:
+            raise ValueError("now() requires a resolution; use now_ns() or utc_now() for full precision")
+        dt = _EPOCH + timedelta(microseconds=ns // 1000)
+        self._cached_ns = ns
+        self._cached_dt = dt
+        return dt
 
 
 def utc_from_timestamp(timestamp: float) -> datetime:
@@ -32,34 +99,425 @@ def utc_from_timestamp(timestamp: float) -> datetime:
     return datetime.fromtimestamp(timestamp, UTC)
 
 
+def _unit_ns(unit: EpochUnit) -> int:
+    """Get the number of nanoseconds in an epoch unit."""
+    try:
+        return _UNIT_NS[unit]
+    except KeyError:
+        raise ValueError(f"Unknown epoch unit: {unit}") from None
+
+
+def utc_from_epoch(value: int, unit: EpochUnit = "s") -> datetime:
+    """Create UTC datetime from an integer Unix epoch without going through float.
+
+    Nanosecond values are truncated to microseconds, the precision of datetime.
+    """
+    return _EPOCH + timedelta(microseconds=value * _unit_ns(unit) // 1000)
+
+
+def utc_to_epoch(dt: datetime, unit: EpochUnit = "s") -> int:
+    """Convert datetime to an integer Unix epoch, rounding down to the unit.
+
+    Naive datetimes are treated as UTC.
+    """
+    micros = (dt - (_NAIVE_EPOCH if dt.tzinfo is None else _EPOCH)) // _MICROSECOND
+    return micros * 1000 // _unit_ns(unit)
+
+
+def utc_from_epochs(values: Iterable[int], unit: EpochUnit = "s") -> list[datetime]:
+    """Batch version of utc_from_epoch, accepting any iterable of ints such as array('q')."""
+    unit_ns = _unit_ns(unit)
+    epoch = _EPOCH
+    if unit_ns >= 1000:
+        scale = unit_ns // 1000
+        return [epoch + timedelta(microseconds=value * scale) for value in values]
+    return [epoch + timedelta(microseconds=value // 1000) for value in values]
+
+
+def utc_to_epochs(values: Iterable[datetime], unit: EpochUnit = "s") -> array[int]:
+    """Batch version of utc_to_epoch, packed into an array('q') buffer."""
+    unit_ns = _unit_ns(unit)
+    micros = ((dt - (_NAIVE_EPOCH if dt.tzinfo is None else _EPOCH)) // _MICROSECOND for dt in values)
+    if unit_ns <= 1000:
+        scale = 1000 // unit_ns
+        return array("q", [value * scale for value in micros])
+    divisor = unit_ns // 1000
+    return array("q", [value // divisor for value in micros])
+
+
+DEFAULT_DATE_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d %H:%M:%S.%f%z",
+    "%Y-%m-%dT%H:%M:%S.%f%z",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M%z",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+)
+"""Formats recognized by parse_datetime, in the order they are tried."""
+
+# (date/time separator, has seconds, has fraction, has timezone) -> the only format that can match that shape
+_SHAPE_FORMATS = {
+    (" ", True, True, True): "%Y-%m-%d %H:%M:%S.%f%z",
+    ("T", True, True, True): "%Y-%m-%dT%H:%M:%S.%f%z",
+    (" ", True, True, False): "%Y-%m-%d %H:%M:%S.%f",
+    ("T", True, False, True): "%Y-%m-%dT%H:%M:%S%z",
+    (" ", True, False, True): "%Y-%m-%d %H:%M:%S%z",
+    (" ", True, False, False): "%Y-%m-%d %H:%M:%S",
+    (" ", False, False, True): "%Y-%m-%d %H:%M%z",
+    (" ", False, False, False): "%Y-%m-%d %H:%M",
+}
+
+
+def _sniff_format(date_str: str) -> tuple[str | None, bool]:
+    """Pick the single candidate format from the string length and separator positions.
+
+    Returns:
+        The candidate format (None for unknown shapes) and whether datetime.fromisoformat
+        is guaranteed to give the same result as strptime with that format
+
+    """
+    size = len(date_str)
+    if size < 10 or date_str[4] != date_str[7]:
+        return None, False
+    if size == 10:
+        if date_str[4] == "-":
+            return "%Y-%m-%d", True
+        if date_str[4] == "/":
+            return "%Y/%m/%d", False
+        return None, False
+    separator = date_str[10]
+    if size < 16 or date_str[4] != "-" or date_str[13] != ":" or separator not in (" ", "T"):
+        return None, False
+
+    pos = 16
+    has_seconds = size > pos and date_str[pos] == ":"
+    if has_seconds:
+        pos = 19
+    has_fraction = size > pos and date_str[pos] == "."
+    tz_start = pos
+    if has_fraction:
+        tz_start = max(date_str.find("+", pos), date_str.find("-", pos))
+        if tz_start == -1:
+            tz_start = size
+    has_tz = tz_start < size
+
+    fmt = _SHAPE_FORMATS.get((separator, has_seconds, has_fraction, has_tz))
+    if fmt is None:
+        return None, False
+
+    # fromisoformat is more lenient than strptime (24:00, 7+ fraction digits, "+HH" offsets, offset minutes >= 60),
+    # so it is only used for shapes where both agree
+    iso = date_str[11:13] < "24" and (not has_fraction or 1 < tz_start - pos <= 7)
+    if has_tz:
+        tz = date_str[tz_start:]
+        digits = tz[1:3] + tz[-2:] if len(tz) == 5 or (len(tz) == 6 and tz[3] == ":") else ""
+        iso = iso and tz[0] in ("+", "-") and digits.isdigit() and digits.isascii() and digits[2] < "6"
+    return fmt, iso
+
+
+def _try_parse(date_str: str, fmt: str, iso: bool) -> datetime | None:
+    """Parse with a single format, returning None instead of raising on mismatch."""
+    try:
+        return datetime.fromisoformat(date_str) if iso else datetime.strptime(date_str, fmt)  # noqa: DTZ007 - naive results are allowed
+    except ValueError:
+        return None
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a DateTimeParser result cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DateTimeParser:
+    """Multi-format datetime parser tuned for streams of similarly formatted strings.
+
+    Formats are compiled once: shapes recognized by length and separator positions go straight
+    to their format, and the format that matched last is tried first for everything else,
+    so homogeneous input costs a single parse attempt per value.
+    If several formats can match the same string, keep them mutually exclusive or expect the
+    most recently successful one to win.
+    With cache_size > 0, results are memoized per (date_str, ignore_tz) in a bounded LRU cache,
+    so repeated strings skip parsing entirely.
+    """
+
+    def __init__(self, formats: Iterable[str] = DEFAULT_DATE_FORMATS, cache_size: int = 0) -> None:
+        """Create a parser.
+
+        Args:
+            formats: strptime formats to try, in order of preference
+            cache_size: Maximum number of memoized results, 0 disables caching
+
+        Raises:
+            ValueError: If no formats are given or cache_size is negative
+
+        """
+        self.formats = tuple(formats)
+        if not self.formats:
+            raise ValueError("At least one format is required")
+        if cache_size < 0:
+            raise ValueError("cache_size must be >= 0")
+        self._known_formats = frozenset(self.formats)
+        self._last_format: str | None = None
+        self._cached_parse = lru_cache(maxsize=cache_size)(self._parse) if cache_size else None
+
+    @property
+    def last_format(self) -> str | None:
+        """Format that matched most recently outside the shape fast path, tried first on the next call."""
+        return self._last_format
+
+    def cache_info(self) -> CacheInfo:
+        """Report hits, misses and size of the result cache (all zeros when caching is disabled)."""
+        if self._cached_parse is None:
+            return CacheInfo(0, 0, 0, 0)
+        info = self._cached_parse.cache_info()
+        return CacheInfo(info.hits, info.misses, info.maxsize or 0, info.currsize)
+
+    def cache_clear(self) -> None:
+        """Drop all memoized results and reset the cache statistics."""
+        if self._cached_parse is not None:
+            self._cached_parse.cache_clear()
+
+    def parse(self, date_str: str, ignore_tz: bool = False) -> datetime:
+        """Parse date string, with timezone handling.
+
+        Converts 'Z' suffix to '+00:00' for ISO format compatibility.
+        Use ignore_tz=True to strip timezone info from the result.
+        """
+        if self._cached_parse is not None:
+            return self._cached_parse(date_str, ignore_tz)
+        return self._parse(date_str, ignore_tz)
+
+    def _parse(self, date_str: str, ignore_tz: bool) -> datetime:
+        """Parse without consulting the result cache."""
+        if date_str.endswith(("z", "Z")):
+            date_str = date_str[:-1] + "+00:00"
+
+        dt: datetime | None = None
+        fmt, iso = _sniff_format(date_str)
+        if fmt is not None and fmt in self._known_formats:
+            dt = _try_parse(date_str, fmt, iso)
+
+        last_format = self._last_format
+        if dt is None and last_format is not None and last_format != fmt:
+            dt = _try_parse(date_str, last_format, False)
+
+        if dt is None:
+            for fmt in self.formats:
+                dt = _try_parse(date_str, fmt, False)
+                if dt is not None:
+                    self._last_format = fmt
+                    break
+            else:
+                raise ValueError(f"Time data '{date_str}' does not match any known format.")
+
+        if ignore_tz and dt.tzinfo is not None:
+            dt = dt.replace(tzinfo=None)
+        return dt
+
+    @overload
+    def iter_parse(
+        self, values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["raise"] = "raise"
+    ) -> Iterator[datetime]: ...
+
+    @overload
+    def iter_parse(
+        self, values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["none"]
+    ) -> Iterator[datetime | None]: ...
+
+    @overload
+    def iter_parse(
+        self, values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["collect"]
+    ) -> Iterator[datetime | ValueError]: ...
+
+    def iter_parse(
+        self, values: Iterable[str], ignore_tz: bool = False, *, on_error: OnError = "raise"
+    ) -> Iterator[datetime | ValueError | None]:
+        """Lazily parse a stream of date strings.
+
+        The format detected for one value is tried first for the next one,
+        so a run of similar values is detected once.
+
+        Args:
+            values: Date strings to parse
+            ignore_tz: Strip timezone info from the results
+            on_error: What to do with unparsable values: "raise" the ValueError,
+                yield None in their place ("none"), or yield the ValueError itself ("collect")
+
+        Returns:
+            Iterator over parsed datetimes, in input order
+
+        Raises:
+            ValueError: If on_error is unknown
+
+        """
+        if on_error not in ("raise", "none", "collect"):
+            raise ValueError(f"Unknown on_error policy: {on_error}")
+        return self._iter_parse(values, ignore_tz, on_error)
+
+    def _iter_parse(self, values: Iterable[str], ignore_tz: bool, on_error: OnError) -> Iterator[datetime | ValueError | None]:
+        """Generate iter_parse results once the arguments are validated."""
+        parse = self.parse
+        for value in values:
+            try:
+                dt = parse(value, ignore_tz)
+            except ValueError as err:
+                if on_error == "raise":
+                    raise
+                yield None if on_error == "none" else err
+                continue
+            yield dt
+
+
+_default_parser = DateTimeParser()
+
+
 def parse_datetime(date_str: str, ignore_tz: bool = False) -> datetime:
     """Parse date string in various formats, with timezone handling.
 
     Converts 'Z' suffix to '+00:00' for ISO format compatibility.
     Use ignore_tz=True to strip timezone info from the result.
+    Uses a shared DateTimeParser with DEFAULT_DATE_FORMATS.
+    """
+    return _default_parser.parse(date_str, ignore_tz)
+
+
+@overload
+def parse_datetimes(
+    values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["raise"] = "raise"
+) -> list[datetime]: ...
+
+
+@overload
+def parse_datetimes(values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["none"]) -> list[datetime | None]: ...
+
+
+@overload
+def parse_datetimes(
+    values: Iterable[str], ignore_tz: bool = False, *, on_error: Literal["collect"]
+) -> list[datetime | ValueError]: ...
+
+
+def parse_datetimes(values: Iterable[str], ignore_tz: bool = False, *, on_error: OnError = "raise") -> list[Any]:
+    """Parse many date strings at once, in the formats supported by parse_datetime.
+
+    With on_error="none" or "collect" a bad value doesn't abort the batch: its slot holds None
+    or the ValueError describing it. Use DateTimeParser.iter_parse to process values lazily.
+    """
+    return list(DateTimeParser().iter_parse(values, ignore_tz, on_error=on_error))
+
+
+def _interval_us(interval: timedelta) -> int:
+    """Get interval length in microseconds, rejecting non-positive intervals."""
+    micros = interval // _MICROSECOND
+    if micros <= 0:
+        raise ValueError("interval must be positive")
+    return micros
+
+
+def floor_datetime(dt: datetime, interval: timedelta) -> datetime:
+    """Round datetime down to a multiple of interval, aligned to the Unix epoch.
+
+    Buckets are aligned in UTC; naive datetimes are treated as UTC.
     """
-    if date_str.lower().endswith("z"):
-        date_str = date_str[:-1] + "+00:00"
-    date_formats = [
-        "%Y-%m-%d %H:%M:%S.%f%z",
-        "%Y-%m-%dT%H:%M:%S.%f%z",
-        "%Y-%m-%d %H:%M:%S.%f",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M%z",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d",
-        "%Y/%m/%d",
-        # Add more formats as needed
-    ]
-
-    for fmt in date_formats:
-        try:
-            dt = datetime.strptime(date_str, fmt)  # noqa: DTZ007 - timezone deliberately ignored when ignore_tz=True
-            if ignore_tz and dt.tzinfo is not None:
-                dt = dt.replace(tzinfo=None)
-            return dt  # noqa: TRY300 - return in try block is intentional for parse flow
-        except ValueError:
-            continue
-    raise ValueError(f"Time data '{date_str}' does not match any known format.")
+    micros = (dt - (_NAIVE_EPOCH if dt.tzinfo is None else _EPOCH)) // _MICROSECOND
+    return dt - timedelta(microseconds=micros % _interval_us(interval))
+
+
+def ceil_datetime(dt: datetime, interval: timedelta) -> datetime:
+    """Round datetime up to a multiple of interval, aligned to the Unix epoch.
+
+    Buckets are aligned in UTC; naive datetimes are treated as UTC.
+    """
+    micros = (dt - (_NAIVE_EPOCH if dt.tzinfo is None else _EPOCH)) // _MICROSECOND
+    return dt + timedelta(microseconds=-micros % _interval_us(interval))
+
+
+def floor_epoch(value: int, interval: int) -> int:
+    """Round integer epoch down to a multiple of interval (both in the same unit)."""
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    return value - value % interval
+
+
+def ceil_epoch(value: int, interval: int) -> int:
+    """Round integer epoch up to a multiple of interval (both in the same unit)."""
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    return value + -value % interval
+
+
+def tumbling_windows(items: Iterable[T], key: Callable[[T], datetime], size: timedelta) -> Iterator[tuple[datetime, Iterator[T]]]:
+    """Group time-ordered items into consecutive, non-overlapping windows.
+
+    Windows are aligned like floor_datetime and empty ones are skipped. Each window is a lazy
+    iterator over the shared input (as in itertools.groupby), so memory does not grow with
+    window size; consume a window before moving on to the next one.
+
+    Args:
+        items: Items sorted by key
+        key: Function returning the timestamp of an item
+        size: Window length
+
+    Returns:
+        Iterator of (window start, items in the window) pairs
+
+    """
+    _interval_us(size)
+    return groupby(items, key=lambda item: floor_datetime(key(item), size))
+
+
+def sliding_windows(
+    items: Iterable[T], key: Callable[[T], datetime], size: timedelta, step: timedelta
+) -> Iterator[tuple[datetime, list[T]]]:
+    """Group time-ordered items into overlapping windows of given size starting every step.
+
+    Window starts are aligned like floor_datetime and empty windows are skipped.
+    All open windows share one buffer holding each item once, so memory is bounded
+    by the number of items within a single window span.
+
+    Args:
+        items: Items sorted by key
+        key: Function returning the timestamp of an item
+        size: Window length
+        step: Distance between consecutive window starts
+
+    Returns:
+        Iterator of (window start, items in the window) pairs
+
+    """
+    _interval_us(size)
+    _interval_us(step)
+    return _sliding_windows(items, key, size, step)
+
+
+def _sliding_windows(
+    items: Iterable[T], key: Callable[[T], datetime], size: timedelta, step: timedelta
+) -> Iterator[tuple[datetime, list[T]]]:
+    """Generate sliding_windows results once the arguments are validated."""
+    buffer: deque[tuple[datetime, T]] = deque()
+    start: datetime | None = None
+    for item in items:
+        ts = key(item)
+        while start is not None and buffer and ts >= start + size:
+            yield start, [buffered for _, buffered in buffer]
+            start += step
+            while buffer and buffer[0][0] < start:
+                buffer.popleft()
+        if not buffer:
+            first_start = floor_datetime(ts - size, step) + step  # earliest window containing ts
+            start = first_start if start is None else max(start, first_start)
+        if start is not None and ts >= start:  # otherwise ts falls in a gap between windows (step > size)
+            buffer.append((ts, item))
+    while start is not None and buffer:
+        yield start, [buffered for _, buffered in buffer]
+        start += step
+        while buffer and buffer[0][0] < start:
+            buffer.popleft()
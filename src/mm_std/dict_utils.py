@@ -1,9 +1,11 @@
 """Dictionary manipulation utilities with type preservation."""
 
+import re
 from collections import OrderedDict, defaultdict
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from decimal import Decimal
-from typing import TypeVar, overload
+from functools import lru_cache
+from typing import Any, Literal, TypeVar, overload
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -90,3 +92,827 @@ def compact_dict(
 
         result[key] = new_value
     return result
+
+
+def _copy_mapping(mapping: Mapping[Any, Any]) -> MutableMapping[Any, Any]:
+    """Shallow-copy a mapping into the same concrete type, keeping a defaultdict's default_factory."""
+    if type(mapping) is dict:
+        return mapping.copy()
+    if isinstance(mapping, defaultdict):
+        return defaultdict(mapping.default_factory, mapping)
+    if isinstance(mapping, MutableMapping):
+        result = mapping.__class__()
+        result.update(mapping)
+        return result
+    return dict(mapping)
+
+
+# Markers in DictCompactor's per-type table: values of the type are never empty / the type is not resolved yet
+_NEVER_EMPTY: Any = object()
+_UNSEEN: Any = object()
+
+
+class DictCompactor:
+    """compact_dict with its flags compiled once, for applying the same settings to many dictionaries.
+
+    Emptiness is decided with one lookup of the value's exact type in a table built from the flags:
+    each type maps to its empty value (None, "", False or 0), or to a marker for types that are never empty.
+    Subclasses such as IntEnum are resolved with isinstance on first sight and added to the table.
+    Create instances with make_compactor().
+    """
+
+    def __init__(
+        self,
+        defaults: Mapping[Any, Any] | None = None,
+        treat_zero_as_empty: bool = False,
+        treat_false_as_empty: bool = False,
+        treat_empty_string_as_empty: bool = True,
+    ) -> None:
+        """Compile the emptiness table; see compact_dict for the arguments."""
+        self.defaults: Mapping[Any, Any] = {} if defaults is None else defaults
+        self.treat_zero_as_empty = treat_zero_as_empty
+        self.treat_false_as_empty = treat_false_as_empty
+        self.treat_empty_string_as_empty = treat_empty_string_as_empty
+        zero = 0 if treat_zero_as_empty else _NEVER_EMPTY
+        self._empty_values: dict[type[Any], Any] = {
+            type(None): None,
+            bool: False if treat_false_as_empty else _NEVER_EMPTY,
+            str: "" if treat_empty_string_as_empty else _NEVER_EMPTY,
+            int: zero,
+            float: zero,
+            Decimal: zero,
+            list: _NEVER_EMPTY,
+            dict: _NEVER_EMPTY,
+            tuple: _NEVER_EMPTY,
+        }
+
+    def _resolve_empty_value(self, type_: type[Any]) -> Any:  # noqa: ANN401 - empty value of any type
+        """Find the empty value for a type not in the table yet, mirroring compact_dict's isinstance checks."""
+        if issubclass(type_, str):
+            empty = "" if self.treat_empty_string_as_empty else _NEVER_EMPTY
+        elif issubclass(type_, (int, float, Decimal)):
+            empty = 0 if self.treat_zero_as_empty else _NEVER_EMPTY
+        else:
+            empty = _NEVER_EMPTY
+        self._empty_values[type_] = empty
+        return empty
+
+    def is_empty(self, value: Any) -> bool:  # noqa: ANN401 - any dictionary value
+        """Check whether a value counts as empty under this compactor's options."""
+        empty = self._empty_values.get(type(value), _UNSEEN)
+        if empty is _UNSEEN:
+            empty = self._resolve_empty_value(type(value))
+        return empty is not _NEVER_EMPTY and bool(value == empty)
+
+    @overload
+    def __call__(self, mapping: defaultdict[K, V]) -> defaultdict[K, V]: ...
+
+    @overload
+    def __call__(self, mapping: OrderedDict[K, V]) -> OrderedDict[K, V]: ...
+
+    @overload
+    def __call__(self, mapping: dict[K, V]) -> dict[K, V]: ...
+
+    @overload
+    def __call__(self, mapping: MutableMapping[K, V]) -> MutableMapping[K, V]: ...
+
+    def __call__(self, mapping: MutableMapping[K, V]) -> MutableMapping[K, V]:
+        """Compact one dictionary, with the same result as compact_dict.
+
+        Args:
+            mapping: The dictionary to process
+
+        Returns:
+            New dictionary of the same concrete type with empty entries replaced or removed
+
+        """
+        # Copy in C, then only touch the entries that are empty
+        result: MutableMapping[K, V] = _copy_mapping(mapping)
+        self._apply(result, self._empty_keys(mapping))
+        return result
+
+    def compact_inplace(self, mapping: MutableMapping[Any, Any]) -> None:
+        """Compact one dictionary in place, with the same rules as compact_dict.
+
+        Only the keys of empty entries are held in memory besides the mapping itself.
+
+        Args:
+            mapping: The dictionary to modify
+
+        """
+        self._apply(mapping, self._empty_keys(mapping))
+
+    def _empty_keys(self, mapping: Mapping[Any, Any]) -> list[Any]:
+        """Collect the keys of empty entries, so the mapping is not modified while it is iterated."""
+        empty_values = self._empty_values
+        keys = []
+        for key, value in mapping.items():
+            empty = empty_values.get(type(value), _UNSEEN)
+            if empty is _NEVER_EMPTY:
+                continue
+            if empty is _UNSEEN:
+                empty = self._resolve_empty_value(type(value))
+                if empty is _NEVER_EMPTY:
+                    continue
+            if value == empty:
+                keys.append(key)
+        return keys
+
+    def _apply(self, mapping: MutableMapping[Any, Any], empty_keys: list[Any]) -> None:
+        """Replace the given entries with their defaults, or delete the ones without a default."""
+        defaults = self.defaults
+        for key in empty_keys:
+            if key in defaults:
+                mapping[key] = defaults[key]
+            else:
+                del mapping[key]
+
+
+def make_compactor(
+    defaults: Mapping[Any, Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> DictCompactor:
+    """Build a reusable compact_dict for one set of options.
+
+    Faster than calling compact_dict per dictionary when the same options are applied to many records;
+    measure with benchmarks/bench_dict_utils.py.
+
+    Args:
+        defaults: Default values to use for empty entries. If None or key not found, empty entries are removed
+        treat_zero_as_empty: Treat 0 as empty value
+        treat_false_as_empty: Treat False as empty value
+        treat_empty_string_as_empty: Treat "" as empty value
+
+    Returns:
+        Callable that compacts one dictionary, preserving its concrete type
+
+    """
+    return DictCompactor(defaults, treat_zero_as_empty, treat_false_as_empty, treat_empty_string_as_empty)
+
+
+def compact_dict_inplace(
+    mapping: MutableMapping[Any, Any],
+    defaults: Mapping[Any, Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> None:
+    """Replace empty entries in a dictionary with defaults or remove them, modifying the dictionary itself.
+
+    Same rules as compact_dict, without allocating a copy of the mapping: only the keys of empty entries
+    are collected in one pass, then replaced or deleted. Use it for large dictionaries that are not needed
+    in their original form; measure with benchmarks/bench_dict_utils.py.
+
+    Args:
+        mapping: The dictionary to modify
+        defaults: Default values to use for empty entries. If None or key not found, empty entries are removed
+        treat_zero_as_empty: Treat 0 as empty value
+        treat_false_as_empty: Treat False as empty value
+        treat_empty_string_as_empty: Treat "" as empty value
+
+    """
+    DictCompactor(defaults, treat_zero_as_empty, treat_false_as_empty, treat_empty_string_as_empty).compact_inplace(mapping)
+
+
+@overload
+def compact_dicts(
+    mappings: Iterable[defaultdict[K, V]],
+    defaults: Mapping[K, V] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> Iterator[defaultdict[K, V]]: ...
+
+
+@overload
+def compact_dicts(
+    mappings: Iterable[OrderedDict[K, V]],
+    defaults: Mapping[K, V] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> Iterator[OrderedDict[K, V]]: ...
+
+
+@overload
+def compact_dicts(
+    mappings: Iterable[dict[K, V]],
+    defaults: Mapping[K, V] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> Iterator[dict[K, V]]: ...
+
+
+def compact_dicts(
+    mappings: Iterable[MutableMapping[K, V]],
+    defaults: Mapping[K, V] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+) -> Iterator[MutableMapping[K, V]]:
+    """Lazily apply compact_dict with the same options to a stream of dictionaries.
+
+    The options are compiled once (see make_compactor), and records are processed one at a time
+    as the result is iterated.
+
+    Args:
+        mappings: Dictionaries to process, e.g. API records
+        defaults: Default values to use for empty entries. If None or key not found, empty entries are removed
+        treat_zero_as_empty: Treat 0 as empty value
+        treat_false_as_empty: Treat False as empty value
+        treat_empty_string_as_empty: Treat "" as empty value
+
+    Yields:
+        New dictionaries of the same concrete types with empty entries replaced or removed
+
+    """
+    compactor = DictCompactor(defaults, treat_zero_as_empty, treat_false_as_empty, treat_empty_string_as_empty)
+    return map(compactor, mappings)
+
+
+def _empty_like(mapping: Mapping[Any, Any]) -> MutableMapping[Any, Any]:
+    """Create an empty mapping of the same concrete type, keeping a defaultdict's default_factory.
+
+    Read-only mappings such as MappingProxyType have no empty form to fill, so they get a dict.
+    """
+    if isinstance(mapping, defaultdict):
+        return defaultdict(mapping.default_factory)
+    if isinstance(mapping, MutableMapping):
+        return mapping.__class__()
+    return {}
+
+
+class _Frame:
+    """A container being rebuilt by deep_compact, with the position of its traversal."""
+
+    __slots__ = ("items", "path", "pending_key", "result", "source")
+
+    def __init__(self, source: Any, path: tuple[Any, ...]) -> None:  # noqa: ANN401 - mapping, list or tuple
+        self.source = source
+        self.path = path
+        self.pending_key: Any = None
+        if isinstance(source, Mapping):
+            self.result: Any = _empty_like(source)
+            self.items: Iterator[tuple[Any, Any]] = iter(source.items())
+        else:
+            self.result = []
+            self.items = enumerate(source)
+
+
+@overload
+def deep_compact(  # noqa: UP047 - TypeVar style shared with compact_dict
+    mapping: defaultdict[K, V],
+    defaults: Mapping[tuple[Any, ...], Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+    prune_empty_containers: bool = False,
+) -> defaultdict[K, V]: ...
+
+
+@overload
+def deep_compact(  # noqa: UP047 - TypeVar style shared with compact_dict
+    mapping: OrderedDict[K, V],
+    defaults: Mapping[tuple[Any, ...], Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+    prune_empty_containers: bool = False,
+) -> OrderedDict[K, V]: ...
+
+
+@overload
+def deep_compact(  # noqa: UP047 - TypeVar style shared with compact_dict
+    mapping: dict[K, V],
+    defaults: Mapping[tuple[Any, ...], Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+    prune_empty_containers: bool = False,
+) -> dict[K, V]: ...
+
+
+@overload
+def deep_compact(  # noqa: UP047 - TypeVar style shared with compact_dict
+    mapping: MutableMapping[K, V],
+    defaults: Mapping[tuple[Any, ...], Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+    prune_empty_containers: bool = False,
+) -> MutableMapping[K, V]: ...
+
+
+def deep_compact(  # noqa: UP047 - TypeVar style shared with compact_dict
+    mapping: MutableMapping[K, V],
+    defaults: Mapping[tuple[Any, ...], Any] | None = None,
+    treat_zero_as_empty: bool = False,
+    treat_false_as_empty: bool = False,
+    treat_empty_string_as_empty: bool = True,
+    prune_empty_containers: bool = False,
+) -> MutableMapping[K, V]:
+    """Apply compact_dict to a dictionary and every mapping nested in it, through lists and tuples.
+
+    Traverses with an explicit stack, so deeply nested documents do not hit the recursion limit.
+    Every mapping, at the root or nested, is compacted and keeps its concrete type like compact_dict does
+    (defaultdict keeps its default_factory); read-only mappings such as MappingProxyType become dicts.
+    List and tuple items are never removed, so positions keep their meaning; mappings inside them are compacted.
+
+    Args:
+        mapping: The dictionary to process
+        defaults: Default values for empty entries, keyed by path of dict keys from the root,
+                  e.g. {("user", "email"): "unknown"}. Lists are transparent: ("items", "price")
+                  applies to the "price" of every dict in the "items" list.
+                  Entries without a default are removed.
+        treat_zero_as_empty: Treat 0 as empty value
+        treat_false_as_empty: Treat False as empty value
+        treat_empty_string_as_empty: Treat "" as empty value
+        prune_empty_containers: Treat dict values that are, or become, empty dicts, lists or tuples as empty
+
+    Returns:
+        New dictionary of the same concrete type with empty entries replaced or removed at every level
+
+    Raises:
+        ValueError: If a container contains itself
+
+    """
+    if defaults is None:
+        defaults = {}
+    is_empty = DictCompactor(None, treat_zero_as_empty, treat_false_as_empty, treat_empty_string_as_empty).is_empty
+
+    def add(frame: _Frame, key: Any, value: Any, is_container: bool) -> None:  # noqa: ANN401 - any dictionary value
+        if isinstance(frame.result, list):
+            frame.result.append(value)
+            return
+        if (prune_empty_containers and not value) if is_container else is_empty(value):
+            path = (*frame.path, key)
+            if path in defaults:
+                frame.result[key] = defaults[path]
+            return
+        frame.result[key] = value
+
+    root = _Frame(mapping, ())
+    stack = [root]
+    on_stack = {id(mapping)}
+    # Whether values of each type are traversed, resolved once per type: mappings, and exact lists and tuples
+    traversed: dict[type[Any], bool] = {dict: True, list: True, tuple: True, str: False, int: False, type(None): False}
+    while stack:
+        frame = stack[-1]
+        for key, value in frame.items:
+            is_container = traversed.get(type(value))
+            if is_container is None:
+                is_container = traversed[type(value)] = isinstance(value, Mapping)
+            if is_container:
+                if id(value) in on_stack:
+                    raise ValueError(f"Cycle detected at path {(*frame.path, key)!r}")
+                frame.pending_key = key
+                # Lists are transparent for default paths
+                stack.append(_Frame(value, frame.path if isinstance(frame.result, list) else (*frame.path, key)))
+                on_stack.add(id(value))
+                break
+            add(frame, key, value, is_container=False)
+        else:
+            stack.pop()
+            on_stack.discard(id(frame.source))
+            if stack:
+                result = tuple(frame.result) if type(frame.source) is tuple else frame.result
+                parent = stack[-1]
+                add(parent, parent.pending_key, result, is_container=True)
+    result_mapping: MutableMapping[K, V] = root.result
+    return result_mapping
+
+
+# Marker for a missing key in get_path, distinct from a stored None
+_MISSING: Any = object()
+
+_PATH_PART = re.compile(r"([^.\[\]]*)((?:\[\d+\])*)")
+
+
+def _as_index(segment: str) -> int | None:
+    """Return the list index a path segment stands for, or None if it is a plain key."""
+    return int(segment) if segment.isascii() and segment.isdecimal() else None
+
+
+class CompiledPath:
+    """A nested path parsed once, for reading and writing the same location in many documents.
+
+    Each step is a key with its list index: digit segments address list items, and also
+    dictionary keys given either as the string or as the integer.
+    Create instances with compile_path().
+    """
+
+    __slots__ = ("_steps", "path")
+
+    def __init__(self, path: str) -> None:
+        """Parse a path such as "a.b[0].c" or "a.b.0.c"."""
+        steps: list[tuple[str, int | None]] = []
+        for i, part in enumerate(path.split(".")):
+            match = _PATH_PART.fullmatch(part)
+            name = match.group(1) if match else ""
+            indices = match.group(2) if match else ""
+            if match is None or (not name and not (indices and i == 0)):
+                raise ValueError(f"Invalid path: {path!r}")
+            if name:
+                steps.append((name, _as_index(name)))
+            if indices:
+                steps.extend((index, int(index)) for index in indices[1:-1].split("]["))
+        self.path = path
+        self._steps = tuple(steps)
+
+    def __repr__(self) -> str:
+        """Show the source path."""
+        return f"CompiledPath({self.path!r})"
+
+    @property
+    def segments(self) -> tuple[str | int, ...]:
+        """Path segments, with list indices as integers."""
+        return tuple(key if index is None else index for key, index in self._steps)
+
+    def get(self, data: Mapping[Any, Any], default: Any = None) -> Any:  # noqa: ANN401 - any nested value
+        """Read the value at this path.
+
+        Args:
+            data: The document to read from
+            default: Value returned when the path does not exist
+
+        Returns:
+            The value at the path, or default
+
+        """
+        current: Any = data
+        for key, index in self._steps:
+            if type(current) is dict or isinstance(current, Mapping):
+                value = current.get(key, _MISSING)
+                if value is _MISSING:
+                    if index is None:
+                        return default
+                    value = current.get(index, _MISSING)
+                    if value is _MISSING:
+                        return default
+                current = value
+            elif index is not None and type(current) in (list, tuple) and index < len(current):
+                current = current[index]
+            else:
+                return default
+        return current
+
+    def set(self, data: MutableMapping[Any, Any], value: Any) -> None:  # noqa: ANN401 - any nested value
+        """Write a value at this path, creating missing containers.
+
+        A missing container is a list when the next segment is a digit, otherwise a dict.
+        Writing past the end of a list pads it with None.
+
+        Args:
+            data: The document to modify
+            value: The value to store
+
+        Raises:
+            ValueError: If the path runs into a value that is not a dict or list
+
+        """
+        current: Any = data
+        last = len(self._steps) - 1
+        for i, (key, index) in enumerate(self._steps):
+            if i == last:
+                _assign(current, key, index, value, self.path)
+                return
+            child = _child(current, key, index)
+            if child is _MISSING:
+                child = [] if self._steps[i + 1][1] is not None else {}
+                _assign(current, key, index, child, self.path)
+            current = child
+
+
+def _child(container: Any, key: str, index: int | None) -> Any:  # noqa: ANN401 - any nested value
+    """Return the existing child of a container for one path step, or _MISSING."""
+    if isinstance(container, Mapping):
+        child = container.get(key, _MISSING)
+        if child is _MISSING and index is not None:
+            child = container.get(index, _MISSING)
+        return child
+    if type(container) is list and index is not None and index < len(container):
+        return container[index]
+    return _MISSING
+
+
+def _assign(container: Any, key: str, index: int | None, value: Any, path: str) -> None:  # noqa: ANN401 - any nested value
+    """Store a value in a dict or list for one path step, padding lists with None."""
+    if isinstance(container, MutableMapping):
+        container[index if index is not None and key not in container and index in container else key] = value
+    elif type(container) is list and index is not None:
+        if index < len(container):
+            container[index] = value
+        else:
+            container.extend([None] * (index - len(container)))
+            container.append(value)
+    else:
+        raise ValueError(f"Cannot set {path!r}: {key!r} does not address a dict key or list item")
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> CompiledPath:
+    """Parse a nested path once; repeated calls with the same path return the cached result.
+
+    Segments are separated by dots; list items are addressed with [n] or a digit segment,
+    so "a.b[0].c" and "a.b.0.c" are the same path.
+
+    Args:
+        path: The path to parse
+
+    Returns:
+        Compiled path with get and set methods
+
+    Raises:
+        ValueError: If the path has empty segments or malformed brackets
+
+    """
+    return CompiledPath(path)
+
+
+def get_path(data: Mapping[Any, Any], path: str, default: Any = None) -> Any:  # noqa: ANN401 - any nested value
+    """Read a nested value such as "a.b[0].c", returning default if any segment is missing.
+
+    Args:
+        data: The document to read from
+        path: Dotted path; see compile_path for the syntax
+        default: Value returned when the path does not exist
+
+    Returns:
+        The value at the path, or default
+
+    """
+    return compile_path(path).get(data, default)
+
+
+def set_path(data: MutableMapping[Any, Any], path: str, value: Any) -> None:  # noqa: ANN401 - any nested value
+    """Write a nested value such as "a.b[0].c", creating missing dicts and lists.
+
+    Args:
+        data: The document to modify
+        path: Dotted path; see compile_path for the syntax
+        value: The value to store
+
+    Raises:
+        ValueError: If the path is malformed or runs into a value that is not a dict or list
+
+    """
+    compile_path(path).set(data, value)
+
+
+def iter_flatten(data: Mapping[Any, Any], sep: str = ".") -> Iterator[tuple[str, Any]]:
+    """Yield (path, value) for every leaf of a nested document, depth first in key order.
+
+    Lists and tuples are flattened with their indices as segments. Empty dicts, lists and tuples
+    are yielded as leaves, so unflatten restores them. Traversal uses an explicit stack, and each
+    container's prefix is built once and shared by all of its keys.
+
+    Args:
+        data: The document to flatten
+        sep: Separator between path segments
+
+    Yields:
+        Pairs of joined path and leaf value
+
+    Raises:
+        ValueError: If a container contains itself
+
+    """
+    stack: list[tuple[str, Iterator[tuple[Any, Any]], int]] = [("", iter(data.items()), id(data))]
+    on_stack = {id(data)}
+    # How to iterate each value type, resolved once per type; None for leaves
+    expanders: dict[type[Any], Any] = {dict: dict.items, list: enumerate, tuple: enumerate, str: None, int: None}
+    while stack:
+        prefix, items, _ = stack[-1]
+        for key, value in items:
+            path = prefix + (key if type(key) is str else str(key))
+            expand = expanders.get(type(value), _UNSEEN)
+            if expand is _UNSEEN:
+                expand = expanders[type(value)] = type(value).items if isinstance(value, Mapping) else None
+            if expand is not None and value:
+                if id(value) in on_stack:
+                    raise ValueError(f"Cycle detected at path {path!r}")
+                on_stack.add(id(value))
+                stack.append((path + sep, iter(expand(value)), id(value)))
+                break
+            yield path, value
+        else:
+            on_stack.discard(stack.pop()[2])
+
+
+def flatten(data: Mapping[Any, Any], sep: str = ".") -> dict[str, Any]:
+    """Flatten a nested document into a single-level dict keyed by joined paths.
+
+    Args:
+        data: The document to flatten
+        sep: Separator between path segments
+
+    Returns:
+        Dict of path to leaf value, e.g. {"a.b.0.c": 1}; see iter_flatten
+
+    Raises:
+        ValueError: If a container contains itself
+
+    """
+    return dict(iter_flatten(data, sep))
+
+
+def unflatten(items: Mapping[str, Any] | Iterable[tuple[str, Any]], sep: str = ".") -> dict[str, Any]:
+    """Rebuild a nested document from flattened (path, value) pairs, the inverse of flatten.
+
+    A container is a list when its first child segment is a digit, otherwise a dict.
+    Containers are remembered by their path prefix, so sibling keys do not walk down from the root.
+
+    Args:
+        items: Flattened mapping or stream of (path, value) pairs
+        sep: Separator between path segments
+
+    Returns:
+        Nested dict
+
+    Raises:
+        ValueError: If a path is both a leaf and a container, or a list gets a non-digit key
+
+    """
+    result: dict[str, Any] = {}
+    containers: dict[str | None, Any] = {None: result}
+    leaves: set[str] = set()
+    for path, value in items.items() if isinstance(items, Mapping) else items:
+        if path in containers:
+            raise ValueError(f"Path {path!r} is both a value and a container")
+        parent_path, found, key = path.rpartition(sep)
+        parent = containers.get(parent_path if found else None)
+        if parent is None:
+            parent = _build_containers(path, sep, containers, leaves)
+        if type(parent) is dict:
+            parent[key] = value
+        else:
+            _assign(parent, key, _as_index(key), value, path)
+        leaves.add(path)
+    return result
+
+
+def _parent_path(path: str, sep: str) -> str | None:
+    """Return the prefix of a flattened path without its last segment, or None at the top level."""
+    return path.rpartition(sep)[0] if sep in path else None
+
+
+def _build_containers(path: str, sep: str, containers: dict[str | None, Any], leaves: set[str]) -> Any:  # noqa: ANN401 - dict or list
+    """Create the missing ancestors of a flattened path and return its parent container."""
+    missing: list[str] = []
+    ancestor = _parent_path(path, sep)
+    while ancestor is not None and ancestor not in containers:
+        missing.append(ancestor)
+        ancestor = _parent_path(ancestor, sep)
+    parent = containers[ancestor]
+    # Walk down from the nearest existing ancestor; each container's type follows its child's segment
+    for i in range(len(missing) - 1, -1, -1):
+        prefix = missing[i]
+        if prefix in leaves:
+            raise ValueError(f"Path {prefix!r} is both a value and a container")
+        key = prefix.rpartition(sep)[2]
+        next_key = (missing[i - 1] if i else path).rpartition(sep)[2]
+        container: Any = [] if _as_index(next_key) is not None else {}
+        _assign(parent, key, _as_index(key), container, path)
+        containers[prefix] = parent = container
+    return parent
+
+
+MergeStrategy = Literal["replace", "append", "unique"]
+
+
+@overload
+def deep_merge(  # noqa: UP047 - TypeVar style shared with compact_dict
+    base: defaultdict[K, V],
+    *overrides: Mapping[Any, Any],
+    strategy: MergeStrategy = "replace",
+    unique_key: str | None = None,
+) -> defaultdict[K, V]: ...
+
+
+@overload
+def deep_merge(  # noqa: UP047 - TypeVar style shared with compact_dict
+    base: OrderedDict[K, V],
+    *overrides: Mapping[Any, Any],
+    strategy: MergeStrategy = "replace",
+    unique_key: str | None = None,
+) -> OrderedDict[K, V]: ...
+
+
+@overload
+def deep_merge(  # noqa: UP047 - TypeVar style shared with compact_dict
+    base: dict[K, V],
+    *overrides: Mapping[Any, Any],
+    strategy: MergeStrategy = "replace",
+    unique_key: str | None = None,
+) -> dict[K, V]: ...
+
+
+def deep_merge(  # noqa: UP047 - TypeVar style shared with compact_dict
+    base: MutableMapping[K, V],
+    *overrides: Mapping[Any, Any],
+    strategy: MergeStrategy = "replace",
+    unique_key: str | None = None,
+) -> MutableMapping[K, V]:
+    """Merge override dictionaries into a base dictionary, recursively, without modifying any input.
+
+    Nested dicts present on both sides are merged; any other override value replaces the base value.
+    The result shares every sub-tree the overrides do not touch with the inputs, and each touched
+    dict or list is copied once however many overrides reach it, so layering many overlays costs
+    the size of the overlays rather than of the base. Copied dicts keep their concrete type like
+    compact_dict does (defaultdict keeps its default_factory).
+
+    Args:
+        base: The dictionary to merge into
+        *overrides: Dictionaries applied in order, later ones winning
+        strategy: How to combine two lists: "replace" uses the override list, "append" concatenates them,
+                  "unique" appends only items not already present
+        unique_key: With strategy="unique", identify dict items by this key; an override item replaces
+                    the base item with the same key value in place
+
+    Returns:
+        New dictionary of the same concrete type as base
+
+    Raises:
+        ValueError: If strategy is unknown, or unique_key is given without strategy="unique"
+
+    """
+    if strategy not in ("replace", "append", "unique"):
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if unique_key is not None and strategy != "unique":
+        raise ValueError('unique_key requires strategy="unique"')
+
+    result: MutableMapping[K, V] = _copy_mapping(base)
+    # Containers created by this call, safe to modify in place; holding them keeps their ids unique
+    owned: dict[int, Any] = {id(result): result}
+    # Whether values of each type are merged as mappings, resolved once per type
+    is_mapping: dict[type[Any], bool] = {dict: True, list: False, str: False, int: False, float: False, bool: False}
+    for override in overrides:
+        stack: list[tuple[MutableMapping[Any, Any], Mapping[Any, Any]]] = [(result, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key, _MISSING)
+                if current is _MISSING:
+                    target[key] = value
+                    continue
+                value_is_mapping = is_mapping.get(type(value))
+                if value_is_mapping is None:
+                    value_is_mapping = is_mapping[type(value)] = isinstance(value, Mapping)
+                current_is_mapping = is_mapping.get(type(current))
+                if current_is_mapping is None:
+                    current_is_mapping = is_mapping[type(current)] = isinstance(current, Mapping)
+                if value_is_mapping and current_is_mapping:
+                    if id(current) not in owned:
+                        current = target[key] = _copy_mapping(current)
+                        owned[id(current)] = current
+                    stack.append((current, value))
+                elif strategy != "replace" and type(value) is list and type(current) is list:
+                    if id(current) not in owned:
+                        current = target[key] = list(current)
+                        owned[id(current)] = current
+                    if strategy == "append":
+                        current.extend(value)
+                    else:
+                        _extend_unique(current, value, unique_key)
+                else:
+                    target[key] = value
+    return result
+
+
+def _unique_id(item: Any, unique_key: str | None) -> Any:  # noqa: ANN401 - list item of any type
+    """Identify a list item for the "unique" strategy: (True, key value) for keyed dicts, (False, item) otherwise.
+
+    Returns _MISSING for unhashable items, which are compared by equality instead.
+    """
+    if unique_key is not None and isinstance(item, Mapping) and unique_key in item:
+        ident = (True, item[unique_key])
+    else:
+        ident = (False, item)
+    try:
+        hash(ident)
+    except TypeError:
+        return _MISSING
+    return ident
+
+
+def _extend_unique(items: list[Any], new_items: list[Any], unique_key: str | None) -> None:
+    """Append the new items not already present, replacing dict items with the same unique_key value in place."""
+    positions: dict[Any, int] = {}
+    for i, item in enumerate(items):
+        ident = _unique_id(item, unique_key)
+        if ident is not _MISSING:
+            positions.setdefault(ident, i)
+    for item in new_items:
+        ident = _unique_id(item, unique_key)
+        if ident is _MISSING:
+            if item not in items:
+                items.append(item)
+        elif ident in positions:
+            if ident[0]:
+                items[positions[ident]] = item
+        else:
+            positions[ident] = len(items)
+            items.append(item)
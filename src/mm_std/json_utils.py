@@ -1,15 +1,107 @@
-"""Extended JSON encoder with support for Python types."""
+"""Extended JSON encoder and decoder with support for Python types."""
 
+import base64
+import importlib
 import json
-from collections.abc import Callable
-from dataclasses import asdict, is_dataclass
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache, partial
+from itertools import islice
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, ClassVar
+from threading import Lock
+from typing import IO, Any, ClassVar, Literal, NamedTuple
 from uuid import UUID
 
+_UNRESOLVED: Any = object()
+
+# Serializes registrations; readers never take it
+_REGISTRY_LOCK = Lock()
+
+
+def _dataclass_handler(type_: type[Any]) -> Callable[[Any], dict[str, Any]]:
+    """Compile a field accessor for a dataclass type that returns a shallow dict of its fields.
+
+    Unlike dataclasses.asdict, nested values are not deep-copied; the encoder traverses them anyway.
+    Works with __slots__ dataclasses, since fields are read with attrgetter.
+    """
+    names = tuple(field.name for field in fields(type_))
+    if not names:
+        return lambda _: {}
+    if len(names) == 1:
+        name = names[0]
+        get_one = attrgetter(name)
+        return lambda obj: {name: get_one(obj)}
+    get_all = attrgetter(*names)
+    return lambda obj: dict(zip(names, get_all(obj), strict=True))
+
+
+class SerializationCacheInfo(NamedTuple):
+    """Statistics of the serialization cache for cacheable types."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache, 0.0 before the first lookup."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _SerializationCache:
+    """Bounded LRU cache of JSON-native values of cacheable objects, keyed by object identity.
+
+    Entries hold a reference to their object, so its id cannot be reused while it is cached.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[type[Any], int], tuple[Any, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def convert(self, encoder_cls: type[ExtendedJSONEncoder], handler: Callable[[Any], Any], obj: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        """Return the JSON-native value of obj, converting it with handler on a miss."""
+        key = (encoder_cls, id(obj))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Converted outside the lock: nested cacheable objects use the cache too
+        native = _to_json_native(handler(obj), encoder_cls)
+        with self._lock:
+            self._entries[key] = (obj, native)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return native
+
+    def info(self) -> SerializationCacheInfo:
+        """Report hits, misses and size."""
+        with self._lock:
+            return SerializationCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_SERIALIZATION_CACHE = _SerializationCache(maxsize=4096)
+
 
 class ExtendedJSONEncoder(json.JSONEncoder):
     """JSON encoder with extended type support for common Python objects.
@@ -17,54 +109,545 @@ class ExtendedJSONEncoder(json.JSONEncoder):
     Supports built-in Python types, dataclasses, enums, exceptions, and custom registered types.
     Automatically registers pydantic BaseModel if available.
     All type handlers are unified in a single registration system for consistency and performance.
+
+    The registry is copy-on-write: register() publishes new mappings under a lock and encoders read
+    them without locking, so registering while other threads encode is safe. Handlers passed to
+    the constructor apply to that encoder only.
     """
 
-    _type_handlers: ClassVar[dict[type[Any], Callable[[Any], Any]]] = {
-        # Order matters: more specific types first
-        datetime: lambda obj: obj.isoformat(),  # Must be before date (inheritance)
+    _type_handlers: ClassVar[Mapping[type[Any], Callable[[Any], Any]]] = {
+        # The most specific registered type in an object's MRO is used
+        datetime: lambda obj: obj.isoformat(),
         date: lambda obj: obj.isoformat(),
         UUID: str,
         Decimal: str,
         Path: str,
         set: list,
         frozenset: list,
-        bytes: lambda obj: obj.decode("latin-1"),
+        bytes: lambda obj: str(obj, "latin-1"),
+        bytearray: lambda obj: str(obj, "latin-1"),
+        memoryview: lambda obj: str(obj, "latin-1"),
         complex: lambda obj: {"real": obj.real, "imag": obj.imag},
         Enum: lambda obj: obj.value,
         Exception: str,
     }
+    # Handlers registered on this class; _type_handlers adds the ones inherited from base classes
+    _own_handlers: ClassVar[Mapping[type[Any], Callable[[Any], Any]]] = _type_handlers
+
+    _handler_cache: ClassVar[dict[type[Any], Callable[[Any], Any] | None]] = {}
+
+    _cacheable_types: ClassVar[frozenset[type[Any]]] = frozenset()
+    _own_cacheable: ClassVar[frozenset[type[Any]]] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to type.__init_subclass__
+        """Give every subclass its own registry layer, with handlers declared in its body as its own."""
+        super().__init_subclass__(**kwargs)
+        with _REGISTRY_LOCK:
+            cls._own_handlers = cls.__dict__.get("_type_handlers", {})
+            cls._own_cacheable = frozenset()
+            cls._publish_registry()
+
+    def __init__(self, *, type_handlers: Mapping[type[Any], Callable[[Any], Any]] | None = None, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to json.JSONEncoder
+        """Create an encoder.
+
+        Args:
+            type_handlers: Handlers for this encoder instance only, taking precedence over the registered ones.
+                           Global state is not modified; works with json.dumps(obj, cls=ExtendedJSONEncoder, type_handlers=...).
+            **kwargs: Additional arguments passed to json.JSONEncoder
+
+        """
+        super().__init__(**kwargs)
+        self._encoder_cls = _encoder_cls_for(type_handlers, type(self)) if type_handlers else type(self)
 
     @classmethod
-    def register(cls, type_: type[Any], handler: Callable[[Any], Any]) -> None:
+    def register(cls, type_: type[Any], handler: Callable[[Any], Any] | None = None, *, cacheable: bool = False) -> None:
         """Register a custom type with its serialization function.
 
         Args:
             type_: The type to register
-            handler: Function that converts objects of this type to JSON-serializable data
+            handler: Function that converts objects of this type to JSON-serializable data.
+                     May be omitted when only marking a type as cacheable; it keeps the handler it already resolves to.
+            cacheable: Cache the converted value of each object of this type (and its subclasses),
+                       keyed by object identity, in a bounded LRU cache shared by all encoders.
+                       Only for immutable objects, e.g. frozen dataclasses, enums and config objects.
 
         Raises:
-            ValueError: If type_ is a built-in JSON type
+            ValueError: If type_ is a built-in JSON type, or handler is missing without cacheable=True
 
         """
         if type_ in (str, int, float, bool, list, dict, type(None)):
             raise ValueError(f"Cannot override built-in JSON type: {type_.__name__}")
-        cls._type_handlers[type_] = handler
+        if handler is None and not cacheable:
+            raise ValueError("handler is required unless cacheable=True")
+        with _REGISTRY_LOCK:
+            # Publish new mappings instead of mutating the ones readers may be iterating over
+            if handler is not None:
+                cls._own_handlers = {**cls._own_handlers, type_: handler}
+            if cacheable:
+                cls._own_cacheable = cls._own_cacheable | {type_}
+            cls._publish_registry()
+            _cached_encoder_cls.cache_clear()  # cached per-call encoders copied the previous handlers
+            _SERIALIZATION_CACHE.clear()
+
+    @classmethod
+    def cache_info(cls) -> SerializationCacheInfo:
+        """Report hits, misses and size of the cache for types registered with cacheable=True."""
+        return _SERIALIZATION_CACHE.info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop cached values of cacheable types and reset the statistics."""
+        _SERIALIZATION_CACHE.clear()
+
+    @classmethod
+    def _publish_registry(cls) -> None:
+        """Rebuild the registry of this class and its subclasses from their own registrations.
+
+        Resolved handlers are reset last, so a reader that sees the new cache also sees the new handlers.
+        """
+        inherited = super(cls, cls)
+        cls._type_handlers = {**getattr(inherited, "_type_handlers", {}), **cls._own_handlers}
+        cls._cacheable_types = getattr(inherited, "_cacheable_types", frozenset()) | cls._own_cacheable
+        cls._handler_cache = {}
+        for subclass in cls.__subclasses__():
+            subclass._publish_registry()  # noqa: SLF001 - same class hierarchy
+
+    @classmethod
+    def _resolve_handler(cls, type_: type[Any]) -> Callable[[Any], Any] | None:
+        """Find the handler for a type: the most specific registered base class wins.
+
+        Falls back to issubclass checks for types registered as virtual subclasses (ABCs),
+        then to a compiled field accessor for dataclasses.
+        """
+        handlers = cls._type_handlers
+        for base in type_.__mro__:
+            handler = handlers.get(base)
+            if handler is not None:
+                return handler
+        for registered_type, handler in handlers.items():
+            if issubclass(type_, registered_type):
+                return handler
+        if is_dataclass(type_):
+            return _dataclass_handler(type_)
+        return None
+
+    @classmethod
+    def _lookup_handler(cls, type_: type[Any]) -> Callable[[Any], Any] | None:
+        """Get the handler for a type, resolving it once per concrete type."""
+        cache = cls._handler_cache  # read before the handlers, see register()
+        try:
+            return cache[type_]
+        except KeyError:
+            handler = cls._resolve_handler(type_)
+            if handler is not None and not cls._cacheable_types.isdisjoint(type_.__mro__):
+                handler = partial(_SERIALIZATION_CACHE.convert, cls, handler)
+            cache[type_] = handler
+            return handler
 
     def default(self, o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
         """Encode object to JSON-serializable format."""
-        # Check registered type handlers first
-        for type_, handler in self._type_handlers.items():
-            if isinstance(o, type_):
-                return handler(o)
-
-        # Special case: dataclasses (requires is_dataclass check, not isinstance)
-        if is_dataclass(o) and not isinstance(o, type):
-            return asdict(o)  # Don't need recursive serialization
+        # Registered type handlers, then dataclasses, resolved once per type
+        type_ = type(o)
+        encoder_cls = self._encoder_cls
+        handler = encoder_cls._handler_cache.get(type_, _UNRESOLVED)  # noqa: SLF001 - same class hierarchy
+        if handler is _UNRESOLVED:
+            handler = encoder_cls._lookup_handler(type_)  # noqa: SLF001 - same class hierarchy
+        if handler is not None:
+            return handler(o)
 
         return super().default(o)
 
 
-def json_dumps(obj: Any, type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None, **kwargs: Any) -> str:  # noqa: ANN401 - Any required for generic type handler
+def _make_encoder_cls(
+    handlers: Mapping[type[Any], Callable[[Any], Any]], base: type[ExtendedJSONEncoder]
+) -> type[ExtendedJSONEncoder]:
+    """Create an encoder class with extra handlers on top of the ones registered on base."""
+    encoder_cls: type[ExtendedJSONEncoder] = type("TemporaryEncoder", (base,), {"_type_handlers": dict(handlers)})
+    return encoder_cls
+
+
+@lru_cache(maxsize=64)
+def _cached_encoder_cls(
+    key: tuple[type[ExtendedJSONEncoder], frozenset[tuple[type[Any], Callable[[Any], Any]]]],
+) -> type[ExtendedJSONEncoder]:
+    """Create or reuse an encoder class for a base encoder and a set of per-call handlers."""
+    base, handlers = key
+    return _make_encoder_cls(dict(handlers), base)
+
+
+def _encoder_cls_for(
+    handlers: Mapping[type[Any], Callable[[Any], Any]], base: type[ExtendedJSONEncoder] = ExtendedJSONEncoder
+) -> type[ExtendedJSONEncoder]:
+    """Get an encoder class for per-call handlers, cached unless a handler is unhashable."""
+    try:
+        key = (base, frozenset(handlers.items()))
+    except TypeError:
+        return _make_encoder_cls(handlers, base)
+    return _cached_encoder_cls(key)
+
+
+# The built-in handlers for types orjson encodes natively, with the same result
+_ORJSON_NATIVE_HANDLERS = {type_: ExtendedJSONEncoder._type_handlers[type_] for type_ in (UUID, Enum)}  # noqa: SLF001 - snapshot of defaults
+
+_JSON_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _to_json_native(obj: Any, encoder_cls: type[ExtendedJSONEncoder], check_circular: bool = True) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+    """Convert an object graph to JSON-native types in one pass, using the encoder's handlers.
+
+    Mirrors the checks json.JSONEncoder does before calling default(), so the result encodes
+    to the same JSON. Like json.dumps, circular references raise ValueError("Circular reference detected")
+    unless check_circular is False, in which case they raise RecursionError.
+    """
+    handler_cache = encoder_cls._handler_cache  # noqa: SLF001 - shares the encoder's resolved handlers
+    lookup_handler = encoder_cls._lookup_handler  # noqa: SLF001 - shares the encoder's resolved handlers
+
+    scalar_types = _JSON_SCALAR_TYPES
+    # Ids of the containers and handler inputs on the current path, as json.JSONEncoder tracks them
+    markers: set[int] | None = set() if check_circular else None
+
+    def marked(o: Any, func: Callable[[Any], Any], arg: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        # Calls func(arg) with o on the current path, raising like json.JSONEncoder if it already is
+        if markers is None:
+            return func(arg)
+        marker = id(o)
+        if marker in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(marker)
+        try:
+            return func(arg)
+        finally:
+            markers.discard(marker)
+
+    def convert_item(value: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        # Hot path for container items: registered types are dispatched without entering convert()
+        handler = handler_cache.get(type(value))
+        if handler is None:
+            return convert(value)
+        native = handler(value)
+        # The handler input stays on the path while its result is converted, as for json.JSONEncoder.default()
+        return native if type(native) in scalar_types else marked(value, convert, native)
+
+    def convert(o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        return o if type(o) in scalar_types else marked(o, convert_container, o)
+
+    def convert_container(o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        type_ = type(o)
+        if type_ is dict:
+            converted_dict = None
+            for key, value in o.items():
+                if type(value) not in scalar_types:
+                    new_value = convert_item(value)
+                    if new_value is not value:
+                        if converted_dict is None:
+                            converted_dict = o.copy()
+                        converted_dict[key] = new_value
+            return o if converted_dict is None else converted_dict
+        if type_ is list or type_ is tuple:
+            converted_list = None
+            for index, value in enumerate(o):
+                if type(value) not in scalar_types:
+                    new_value = convert_item(value)
+                    if new_value is not value:
+                        if converted_list is None:
+                            converted_list = list(o)
+                        converted_list[index] = new_value
+            return o if converted_list is None else converted_list
+        if isinstance(o, (str, int, float)):  # subclasses are encoded natively, e.g. IntEnum
+            return o
+        if isinstance(o, dict):
+            return {key: convert(value) for key, value in o.items()}
+        if isinstance(o, (list, tuple)):
+            return [convert(value) for value in o]
+
+        handler = handler_cache.get(type_, _UNRESOLVED)
+        if handler is _UNRESOLVED:
+            handler = lookup_handler(type_)
+        if handler is not None:
+            return convert(handler(o))
+        raise TypeError(f"Object of type {type_.__name__} is not JSON serializable")
+
+    return convert(obj)
+
+
+DumpsMode = Literal["default", "precompute", "canonical"]
+
+_CANONICAL_OPTIONS: dict[str, Any] = {"separators": (",", ":"), "ensure_ascii": False, "allow_nan": False}
+
+_CANONICAL_NATIVE_TYPES = frozenset({str, int, bool, type(None)})
+
+# Floats with an exact integer value are written as integers below this magnitude
+_CANONICAL_INT_LIMIT = 2**53
+
+
+def _canonical_decimal(value: Decimal) -> str:
+    """Format a Decimal without exponent or trailing zeros: 1.50, 15E-1 and 1.5 all become "1.5"."""
+    if not value.is_finite():
+        raise ValueError(f"Canonical JSON cannot represent Decimal {value}")
+    if value.is_zero():
+        return "0"
+    text = format(value, "f")
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+@lru_cache(maxsize=1024)
+def _canonical_order(keys: tuple[Any, ...]) -> tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]:
+    """Get the sorted keys of one dict shape and a getter for its values in that order, built once per shape."""
+    for key in keys:
+        if not isinstance(key, str):
+            raise TypeError(f"Canonical JSON requires str keys, got {type(key).__name__}")
+    order = tuple(sorted(keys))
+    if len(order) == 1:
+        key = order[0]
+        return order, lambda obj: (obj[key],)
+    return order, itemgetter(*order)
+
+
+def _to_canonical(obj: Any, encoder_cls: type[ExtendedJSONEncoder]) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+    """Convert an object graph to JSON-native types with sorted dicts and normalized numbers."""
+    lookup_handler = encoder_cls._lookup_handler  # noqa: SLF001 - shares the encoder's resolved handlers
+    native_types = _CANONICAL_NATIVE_TYPES
+
+    def canonical_float(value: float) -> float | int:
+        if value.is_integer() and -_CANONICAL_INT_LIMIT < value < _CANONICAL_INT_LIMIT:
+            return int(value)
+        return value
+
+    # Ids of the containers and handler inputs on the current path, as in _to_json_native
+    markers: set[int] = set()
+
+    def convert(o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        type_ = type(o)
+        if type_ in native_types:
+            return o
+        if type_ is float:
+            return canonical_float(o)
+        marker = id(o)
+        if marker in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(marker)
+        try:
+            return convert_marked(o, type_)
+        finally:
+            markers.discard(marker)
+
+    def convert_marked(o: Any, type_: type[Any]) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        if isinstance(o, dict):
+            if not o:
+                return {}
+            order, get_values = _canonical_order(tuple(o))
+            values = [value if type(value) in native_types else convert(value) for value in get_values(o)]
+            return dict(zip(order, values, strict=True))
+        if isinstance(o, (list, tuple)):
+            return [convert(value) for value in o]
+        if isinstance(o, (str, int)):  # subclasses are encoded natively, e.g. IntEnum
+            return o
+        if isinstance(o, float):
+            return canonical_float(float(o))
+        handler = lookup_handler(type_)
+        if handler is not None:
+            return convert(handler(o))
+        raise TypeError(f"Object of type {type_.__name__} is not JSON serializable")
+
+    return convert(obj)
+
+
+BytesMode = Literal["latin-1", "base64", "base85", "hex"]
+
+# Every function here reads any bytes-like object through the buffer protocol, without a bytes copy
+_BYTES_HANDLERS: dict[str, Callable[[Any], str]] = {
+    "latin-1": lambda obj: str(obj, "latin-1"),
+    "base64": lambda obj: base64.b64encode(obj).decode("ascii"),
+    "base85": lambda obj: base64.b85encode(obj).decode("ascii"),
+    "hex": lambda obj: obj.hex(),
+}
+
+
+PydanticMode = Literal["python", "json"]
+
+# Filled by _auto_register_optional_types when pydantic is installed
+_PYDANTIC_JSON_HANDLERS: dict[type[Any], Callable[[Any], Any]] = {}
+
+
+def _with_call_options(
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None, bytes_mode: BytesMode, pydantic_mode: PydanticMode
+) -> dict[type[Any], Callable[[Any], Any]] | None:
+    """Add handlers for bytes_mode and pydantic_mode to per-call handlers; explicit type_handlers still win."""
+    bytes_handler = _BYTES_HANDLERS.get(bytes_mode)
+    if bytes_handler is None:
+        raise ValueError(f"Unknown bytes_mode: {bytes_mode}")
+    if pydantic_mode not in ("python", "json"):
+        raise ValueError(f"Unknown pydantic_mode: {pydantic_mode}")
+    if bytes_mode == "latin-1" and pydantic_mode == "python":  # the registered defaults
+        return type_handlers
+    handlers: dict[type[Any], Callable[[Any], Any]] = {}
+    if bytes_mode != "latin-1":
+        handlers.update(dict.fromkeys((bytes, bytearray, memoryview), bytes_handler))
+    # pydantic's JSON serializer has its own bytes formats, so a bytes_mode keeps models on model_dump()
+    if pydantic_mode == "json" and bytes_mode == "latin-1":
+        handlers.update(_PYDANTIC_JSON_HANDLERS)
+    return {**handlers, **(type_handlers or {})}
+
+
+Backend = Literal["stdlib", "auto"]
+
+_ORJSON_OPTIONS = frozenset({"ensure_ascii", "indent", "separators", "sort_keys"})
+
+
+@lru_cache(maxsize=1)
+def _load_orjson() -> Any:  # noqa: ANN401 - optional module without a hard dependency
+    """Import orjson if it is installed; it is an optional backend, not a dependency."""
+    try:
+        return importlib.import_module("orjson")
+    except ImportError:
+        return None
+
+
+def _orjson_option(orjson: Any, kwargs: Mapping[str, Any]) -> int | None:  # noqa: ANN401 - optional module
+    """Map json.dumps options to orjson options, or None if orjson would not produce the same text.
+
+    orjson writes UTF-8 with either compact separators or indent=2, so only ensure_ascii=False
+    with separators=(",", ":"), or with indent=2 and default separators, is supported.
+    """
+    if not kwargs.keys() <= _ORJSON_OPTIONS or kwargs.get("ensure_ascii", True):
+        return None
+    # Datetimes and dataclasses go through the registered handlers, not orjson's own formatting
+    option: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    indent = kwargs.get("indent")
+    separators = kwargs.get("separators")
+    if indent is None:
+        if separators is None or tuple(separators) != (",", ":"):
+            return None
+    elif indent == 2 and type(indent) is int and (separators is None or tuple(separators) == (",", ": ")):
+        option |= orjson.OPT_INDENT_2
+    else:
+        return None
+    if kwargs.get("sort_keys"):
+        option |= orjson.OPT_SORT_KEYS
+    return option
+
+
+def _orjson_handles_natively(encoder_cls: type[ExtendedJSONEncoder]) -> bool:
+    """Check that the encoder's handlers for UUID and Enum, which orjson encodes itself, are the built-in ones."""
+    for type_, handler in encoder_cls._type_handlers.items():  # noqa: SLF001 - reading the encoder's registry
+        if issubclass(type_, (UUID, Enum)) and handler is not _ORJSON_NATIVE_HANDLERS.get(type_):
+            return False
+    return True
+
+
+# Value types orjson writes exactly as the json module does
+_ORJSON_PLAIN_TYPES = frozenset({str, int, bool, type(None)})
+
+# Finite floats in this magnitude range (and zero) are written identically by orjson and the json module;
+# outside it Python switches to exponent form (1e-05, 1e+16) while orjson does not, or spells it differently
+_ORJSON_FLOAT_MIN = 1e-4
+_ORJSON_FLOAT_MAX = 1e16
+
+
+def _contains_mismatched_float(obj: Any) -> bool:  # noqa: ANN401 - Any required for generic JSON encoding
+    """Check whether orjson would write a float in obj differently from the json module, without calling default.
+
+    orjson writes NaN and infinity as null and spells exponent-form floats differently, and has no hook
+    to change that, so payloads with such floats are left to the json module. Other floats match.
+    """
+    plain_types = _ORJSON_PLAIN_TYPES
+    low = _ORJSON_FLOAT_MIN
+    high = _ORJSON_FLOAT_MAX
+    stack = [obj]
+    seen: set[int] = set()
+    while stack:
+        o = stack.pop()
+        if isinstance(o, (dict, list, tuple)):
+            if id(o) in seen:
+                continue  # shared or circular; orjson rejects cycles and the json module reports them
+            seen.add(id(o))
+            # One pass per container: plain values are skipped, floats checked inline, the rest visited later
+            for value in o.values() if isinstance(o, dict) else o:
+                type_ = type(value)
+                if type_ in plain_types:
+                    continue
+                if type_ is float:
+                    if not (low <= abs(value) < high or value == 0.0):  # NaN fails every comparison
+                        return True
+                else:
+                    stack.append(value)
+        elif isinstance(o, float):
+            if not (low <= abs(o) < high or o == 0.0):
+                return True
+        elif isinstance(o, Enum):
+            stack.append(o.value)  # orjson encodes members by value without calling default
+    return False
+
+
+class _OrjsonIncompatibleError(Exception):
+    """Raised from orjson's default hook when a handler result must be encoded by the json module."""
+
+
+def _orjson_dumps(obj: Any, encoder_cls: type[ExtendedJSONEncoder], kwargs: Mapping[str, Any]) -> bytes | None:  # noqa: ANN401 - Any required for generic JSON encoding
+    """Encode with orjson when it is installed and gives the same output as the json module, otherwise return None."""
+    orjson = _load_orjson()
+    if orjson is None:
+        return None
+    option = _orjson_option(orjson, kwargs)
+    if option is None or not _orjson_handles_natively(encoder_cls) or _contains_mismatched_float(obj):
+        return None
+    encoder_default = encoder_cls().default
+
+    def default(o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        native = encoder_default(o)
+        if type(native) in _ORJSON_PLAIN_TYPES:
+            return native
+        if _contains_mismatched_float(native):
+            raise _OrjsonIncompatibleError
+        return native
+
+    try:
+        result: bytes = orjson.dumps(obj, default=default, option=option)
+    except orjson.JSONEncodeError:
+        return None  # floats from handlers, non-str keys, 64-bit overflow, cycles, handler errors
+    return result
+
+
+def _dumps(
+    obj: Any,  # noqa: ANN401 - Any required for generic JSON encoding
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None,
+    mode: DumpsMode,
+    bytes_mode: BytesMode,
+    pydantic_mode: PydanticMode,
+    backend: Backend,
+    kwargs: Mapping[str, Any],
+) -> str | bytes:
+    """Encode for json_dumps and json_dumps_bytes; returns bytes when orjson did the encoding."""
+    if mode not in ("default", "precompute", "canonical"):
+        raise ValueError(f"Unknown mode: {mode}")
+    if backend not in ("stdlib", "auto"):
+        raise ValueError(f"Unknown backend: {backend}")
+    type_handlers = _with_call_options(type_handlers, bytes_mode, pydantic_mode)
+    if mode == "canonical":
+        if kwargs:
+            raise ValueError(f"Canonical mode does not accept json.dumps options: {', '.join(kwargs)}")
+        type_handlers = {Decimal: _canonical_decimal, **(type_handlers or {})}
+        return json.dumps(_to_canonical(obj, _encoder_cls_for(type_handlers)), **_CANONICAL_OPTIONS)
+    encoder_cls = _encoder_cls_for(type_handlers) if type_handlers else ExtendedJSONEncoder
+    if backend == "auto":
+        result = _orjson_dumps(obj, encoder_cls, kwargs)
+        if result is not None:
+            return result
+    if mode == "default":
+        return json.dumps(obj, cls=encoder_cls, **kwargs)
+    return json.dumps(_to_json_native(obj, encoder_cls, kwargs.get("check_circular", True)), **kwargs)
+
+
+def json_dumps(
+    obj: Any,  # noqa: ANN401 - Any required for generic JSON encoding
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None,
+    *,
+    mode: DumpsMode = "default",
+    bytes_mode: BytesMode = "latin-1",
+    pydantic_mode: PydanticMode = "python",
+    backend: Backend = "stdlib",
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic type handler
+) -> str:
     """Serialize object to JSON with extended type support.
 
     Unlike standard json.dumps, uses ExtendedJSONEncoder which automatically handles
@@ -74,27 +657,396 @@ def json_dumps(obj: Any, type_handlers: dict[type[Any], Callable[[Any], Any]] |
         obj: Object to serialize to JSON
         type_handlers: Optional additional type handlers for this call only.
                       These handlers take precedence over default ones.
+                      The encoder built for them is cached, so reuse the same handler functions across calls.
+        mode: "default" calls back into ExtendedJSONEncoder.default for every non-native object.
+              "precompute" first converts the whole graph to JSON-native types in one pass, then
+              encodes it without callbacks. Output and errors are identical. It is not a speed-up:
+              benchmarks/bench_json_utils.py shows it slower on mostly native payloads and at best
+              on par when most values are extended types.
+              "canonical" writes deterministic JSON for hashing and signatures: keys sorted, no whitespace,
+              UTF-8 text (ensure_ascii=False), Decimals without exponent or trailing zeros ("1.5"),
+              integral floats as integers (1.0 -> 1), NaN and infinity rejected. It always uses the
+              json module and accepts no json.dumps options.
+        bytes_mode: How bytes, bytearray and memoryview are encoded: "latin-1" (one char per byte),
+                    "base64", "base85" or "hex". Buffers are read in place, without a bytes copy.
+        pydantic_mode: "python" encodes models from model_dump(), passing each field back to the encoder.
+                       "json" uses model_dump(mode="json"), so pydantic's compiled serializer converts the
+                       fields and the encoder only sees JSON-native values. Output is the same except where
+                       pydantic formats differently: UTC datetimes end in "Z" instead of "+00:00", and bytes
+                       fields are decoded as UTF-8 instead of latin-1 (models with bytes that are not valid
+                       UTF-8 are encoded from model_dump()). With a bytes_mode other than "latin-1", models
+                       are encoded from model_dump() so their bytes fields use that bytes_mode.
+        backend: "stdlib" always uses the json module. "auto" uses orjson when it is installed and the
+                 options are ensure_ascii=False with separators=(",", ":"), or ensure_ascii=False with
+                 indent=2; sort_keys is allowed. Registered handlers still apply through orjson's default
+                 hook. Anything else, or an error in orjson, falls back to the json module, and so do
+                 payloads with NaN, infinity or exponent-form floats (magnitude below 1e-4 or from 1e16),
+                 which orjson formats differently. Output is always identical to the json module's.
         **kwargs: Additional arguments passed to json.dumps
 
     Returns:
         JSON string representation
 
+    Raises:
+        ValueError: If mode, bytes_mode, pydantic_mode or backend is unknown, or canonical mode gets
+                    json.dumps options or a non-finite number
+        TypeError: If canonical mode meets a dict key that is not a str
+
     """
-    if type_handlers:
-        # Type narrowing for mypy
-        handlers: dict[type[Any], Callable[[Any], Any]] = type_handlers
+    result = _dumps(obj, type_handlers, mode, bytes_mode, pydantic_mode, backend, kwargs)
+    return result if isinstance(result, str) else result.decode("utf-8")
 
-        class TemporaryEncoder(ExtendedJSONEncoder):
-            _type_handlers: ClassVar[dict[type[Any], Callable[[Any], Any]]] = {
-                **ExtendedJSONEncoder._type_handlers,  # noqa: SLF001 - accessing class internals for type handler inheritance
-                **handlers,
-            }
 
-        encoder_cls: type[json.JSONEncoder] = TemporaryEncoder
-    else:
-        encoder_cls = ExtendedJSONEncoder
+def json_dumps_bytes(
+    obj: Any,  # noqa: ANN401 - Any required for generic JSON encoding
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None,
+    *,
+    mode: DumpsMode = "default",
+    bytes_mode: BytesMode = "latin-1",
+    pydantic_mode: PydanticMode = "python",
+    backend: Backend = "stdlib",
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic type handler
+) -> bytes:
+    """Serialize object to UTF-8 encoded JSON, ready for sockets and binary files.
+
+    Takes the same arguments as json_dumps. With backend="auto", orjson's output is returned as is.
+
+    Returns:
+        UTF-8 encoded JSON
+
+    Raises:
+        ValueError: If mode, bytes_mode, pydantic_mode or backend is unknown
+
+    """
+    result = _dumps(obj, type_handlers, mode, bytes_mode, pydantic_mode, backend, kwargs)
+    return result if isinstance(result, bytes) else result.encode("utf-8")
+
+
+class _StreamedArray(list[Any]):
+    """Iterator stand-in that the pure-Python JSONEncoder.iterencode writes as a JSON array.
+
+    Only the first item is pulled eagerly (to tell an empty array from a non-empty one),
+    the rest is consumed while encoding.
+    """
+
+    def __init__(self, iterator: Iterator[Any]) -> None:
+        super().__init__()
+        self._iterator = iterator
+        self._head = list(islice(iterator, 1))
+
+    def __bool__(self) -> bool:
+        return bool(self._head)
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._head
+        yield from self._iterator
+
+
+class _StreamingEncoder(json.JSONEncoder):
+    """Encoder that writes iterators and generators as JSON arrays, delegating everything else.
+
+    Only valid with iterencode: the C one-shot encoder does not iterate list subclasses.
+    """
+
+    def __init__(self, fallback: json.JSONEncoder, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to json.JSONEncoder
+        super().__init__(**kwargs)
+        self._fallback_default = fallback.default
+
+    def default(self, o: Any) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+        """Encode iterators lazily, other objects with the fallback encoder."""
+        if isinstance(o, Iterator):
+            return _StreamedArray(o)
+        return self._fallback_default(o)
+
+
+def iter_json_chunks(
+    obj: Any,  # noqa: ANN401 - Any required for generic JSON encoding
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None,
+    *,
+    chunk_size: int = 65536,
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic type handler
+) -> Iterator[str]:
+    """Serialize object to JSON lazily, in chunks of about chunk_size characters.
+
+    Built on ExtendedJSONEncoder.iterencode, so the full document is never held in memory.
+    Iterators and generators anywhere in the object are written as JSON arrays without
+    being materialized. Use this directly to feed async writers.
+
+    Args:
+        obj: Object to serialize to JSON
+        type_handlers: Optional additional type handlers, as in json_dumps
+        chunk_size: Minimum chunk length in characters (the last chunk may be shorter)
+        **kwargs: Additional arguments passed to the encoder, as in json.dumps
+
+    Returns:
+        Iterator over JSON text chunks
+
+    Raises:
+        ValueError: If chunk_size is not positive
+
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    encoder_cls = _encoder_cls_for(type_handlers) if type_handlers else ExtendedJSONEncoder
+    encoder = _StreamingEncoder(encoder_cls(**kwargs), **kwargs)
+    return _join_chunks(encoder.iterencode(obj), chunk_size)
+
+
+def _join_chunks(pieces: Iterator[str], chunk_size: int) -> Iterator[str]:
+    """Merge small encoder pieces into chunks of at least chunk_size characters."""
+    buffer: list[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def json_dump_stream(
+    obj: Any,  # noqa: ANN401 - Any required for generic JSON encoding
+    out: IO[Any] | Callable[[Any], object],
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None,
+    *,
+    chunk_size: int = 65536,
+    encoding: str | None = None,
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic type handler
+) -> None:
+    """Serialize object to JSON and write it out in bounded chunks.
+
+    Peak memory stays around chunk_size instead of the size of the whole document;
+    iterators and generators are written as JSON arrays without being materialized.
+
+    Args:
+        obj: Object to serialize to JSON
+        out: File-like object with a write() method, or a callable receiving each chunk
+             (e.g. socket.sendall together with encoding="utf-8")
+        type_handlers: Optional additional type handlers, as in json_dumps
+        chunk_size: Minimum chunk length in characters (the last chunk may be shorter)
+        encoding: Encode chunks to bytes with this encoding before writing, None to write str
+        **kwargs: Additional arguments passed to the encoder, as in json.dumps
+
+    """
+    write = out if callable(out) else out.write
+    for chunk in iter_json_chunks(obj, type_handlers, chunk_size=chunk_size, **kwargs):
+        write(chunk if encoding is None else chunk.encode(encoding))
+
+
+def json_dump_lines(
+    records: Iterable[Any],
+    out: IO[Any] | Callable[[Any], object],
+    type_handlers: dict[type[Any], Callable[[Any], Any]] | None = None,
+    *,
+    chunk_size: int = 65536,
+    encoding: str | None = None,
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic type handler
+) -> None:
+    """Write records as JSON Lines (NDJSON): one JSON document per line.
+
+    A single encoder instance is reused for all records, and lines are written in chunks
+    of at least chunk_size characters.
+
+    Args:
+        records: Objects to serialize, one per line
+        out: File-like object with a write() method, or a callable receiving each chunk
+        type_handlers: Optional additional type handlers, as in json_dumps
+        chunk_size: Minimum chunk length in characters (the last chunk may be shorter)
+        encoding: Encode chunks to bytes with this encoding before writing, None to write str
+        **kwargs: Additional arguments passed to the encoder, as in json.dumps
+
+    Raises:
+        ValueError: If indent is given (records must stay on one line) or chunk_size is not positive
+
+    """
+    if kwargs.get("indent") is not None:
+        raise ValueError("indent is not supported for JSON Lines")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    encoder_cls = _encoder_cls_for(type_handlers) if type_handlers else ExtendedJSONEncoder
+    encode = encoder_cls(**kwargs).encode
+    write = out if callable(out) else out.write
+    for chunk in _join_chunks((encode(record) + "\n" for record in records), chunk_size):
+        write(chunk if encoding is None else chunk.encode(encoding))
 
-    return json.dumps(obj, cls=encoder_cls, **kwargs)
+
+def _iter_raw_lines(source: IO[bytes], buffer_size: int) -> Iterator[bytes]:
+    """Split a binary stream into lines, reading buffer_size bytes at a time."""
+    pending: list[bytes] = []
+    while chunk := source.read(buffer_size):
+        lines = chunk.split(b"\n")
+        if len(lines) == 1:
+            pending.append(chunk)
+            continue
+        if pending:
+            pending.append(lines[0])
+            lines[0] = b"".join(pending)
+            pending.clear()
+        last = lines.pop()
+        if last:
+            pending.append(last)
+        yield from lines
+    if pending:
+        yield b"".join(pending)
+
+
+def _loads_lines(lines: list[bytes], kwargs: dict[str, Any]) -> list[Any]:
+    """Decode a batch of JSON lines (runs in worker processes)."""
+    return [json.loads(line, **kwargs) for line in lines]
+
+
+def iter_json_lines(
+    source: IO[bytes],
+    *,
+    buffer_size: int = 65536,
+    workers: int | None = None,
+    batch_size: int = 1000,
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic json.loads arguments
+) -> Iterator[Any]:
+    """Lazily decode JSON Lines (NDJSON) from a binary stream.
+
+    The stream is read buffer_size bytes at a time, so memory stays bounded by the buffer
+    and the longest line. Blank lines are skipped.
+
+    Args:
+        source: Binary file or stream with a read() method
+        buffer_size: Number of bytes to read at a time
+        workers: Decode batches of lines in a process pool of this size, None to decode in-process.
+                 Worth it only for large records; kwargs must be picklable.
+        batch_size: Number of lines per batch sent to a worker
+        **kwargs: Additional arguments passed to json.loads
+
+    Returns:
+        Iterator over decoded objects, in input order
+
+    Raises:
+        ValueError: If buffer_size, batch_size or workers is not positive
+
+    """
+    if buffer_size <= 0 or batch_size <= 0 or (workers is not None and workers <= 0):
+        raise ValueError("buffer_size, batch_size and workers must be positive")
+    lines = (line for line in _iter_raw_lines(source, buffer_size) if line.strip())
+    if workers is None:
+        return (json.loads(line, **kwargs) for line in lines)
+    return _iter_json_lines_parallel(lines, workers, batch_size, kwargs)
+
+
+def _iter_json_lines_parallel(lines: Iterator[bytes], workers: int, batch_size: int, kwargs: dict[str, Any]) -> Iterator[Any]:
+    """Decode line batches in a process pool, keeping a bounded number of batches in flight."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque[Future[list[Any]]] = deque()
+        while batch := list(islice(lines, batch_size)):
+            in_flight.append(executor.submit(_loads_lines, batch, kwargs))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _to_decimal(value: Any) -> Decimal:  # noqa: ANN401 - Any required for generic JSON decoding
+    """Convert a decoded JSON value to Decimal, going through str for floats to avoid binary noise."""
+    return Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+
+
+class ExtendedJSONDecoder(json.JSONDecoder):
+    """JSON decoder that revives Python types from their ExtendedJSONEncoder representation.
+
+    Fields are revived by name using a schema that maps field names to types (at any depth),
+    with converters from a registry mirroring ExtendedJSONEncoder.register.
+    The per-key converter dispatch is compiled once per decoder.
+    """
+
+    _type_decoders: ClassVar[Mapping[type[Any], Callable[[Any], Any]]] = {
+        datetime: datetime.fromisoformat,
+        date: date.fromisoformat,
+        UUID: UUID,
+        Decimal: _to_decimal,
+        Path: Path,
+    }
+
+    @classmethod
+    def register(cls, type_: type[Any], decoder: Callable[[Any], Any]) -> None:
+        """Register a custom type with its deserialization function.
+
+        Args:
+            type_: The type to register
+            decoder: Function that converts the decoded JSON value back to this type
+
+        Raises:
+            ValueError: If type_ is a built-in JSON type
+
+        """
+        if type_ in (str, int, float, bool, list, dict, type(None)):
+            raise ValueError(f"Cannot override built-in JSON type: {type_.__name__}")
+        with _REGISTRY_LOCK:
+            cls._type_decoders = {**cls._type_decoders, type_: decoder}
+
+    def __init__(self, *, schema: Mapping[str, type[Any]] | None = None, use_decimal: bool = False, **kwargs: Any) -> None:  # noqa: ANN401 - forwarded to json.JSONDecoder
+        """Create a decoder.
+
+        Args:
+            schema: Field name to type mapping; matching fields of every object are revived
+            use_decimal: Parse JSON floats as Decimal (parse_float=Decimal)
+            **kwargs: Additional arguments passed to json.JSONDecoder
+
+        Raises:
+            ValueError: If a schema type has no registered decoder, or schema is combined with object_pairs_hook
+
+        """
+        if use_decimal:
+            kwargs.setdefault("parse_float", Decimal)
+        if schema:
+            if kwargs.get("object_pairs_hook") is not None:
+                raise ValueError("schema cannot be combined with object_pairs_hook")
+            kwargs["object_hook"] = self._compile_object_hook(schema, kwargs.get("object_hook"))
+        super().__init__(**kwargs)
+
+    @classmethod
+    def _compile_object_hook(
+        cls, schema: Mapping[str, type[Any]], object_hook: Callable[[dict[str, Any]], Any] | None
+    ) -> Callable[[dict[str, Any]], Any]:
+        """Build an object_hook applying the schema converters, then the caller's object_hook."""
+        converters: list[tuple[str, Callable[[Any], Any]]] = []
+        for key, type_ in schema.items():
+            decoder = cls._type_decoders.get(type_)
+            if decoder is None:
+                raise ValueError(f"No decoder registered for type: {type_.__name__}")
+            converters.append((key, decoder))
+
+        def revive(obj: dict[str, Any]) -> Any:  # noqa: ANN401 - object_hook may return anything
+            for key, convert in converters:
+                value = obj.get(key)
+                if value is not None:
+                    obj[key] = convert(value)
+            return obj if object_hook is None else object_hook(obj)
+
+        return revive
+
+
+def json_loads(
+    s: str | bytes,
+    schema: Mapping[str, type[Any]] | None = None,
+    *,
+    use_decimal: bool = False,
+    **kwargs: Any,  # noqa: ANN401 - Any required for generic json.loads arguments
+) -> Any:  # noqa: ANN401 - Any required for generic JSON decoding
+    """Deserialize JSON, reviving the types json_dumps writes as strings.
+
+    Args:
+        s: JSON document
+        schema: Field name to type mapping, e.g. {"created_at": datetime, "price": Decimal, "id": UUID}.
+                Matching fields of every object, at any depth, are converted; null values are kept.
+        use_decimal: Parse JSON floats as Decimal instead of float
+        **kwargs: Additional arguments passed to json.loads
+
+    Returns:
+        Decoded object
+
+    """
+    return json.loads(s, cls=ExtendedJSONDecoder, schema=schema, use_decimal=use_decimal, **kwargs)
 
 
 def _auto_register_optional_types() -> None:
@@ -102,8 +1054,17 @@ def _auto_register_optional_types() -> None:
     # Pydantic models
     try:
         from pydantic import BaseModel  # noqa: PLC0415 - optional pydantic import at runtime
+        from pydantic_core import PydanticSerializationError  # noqa: PLC0415 - optional pydantic import at runtime
 
         ExtendedJSONEncoder.register(BaseModel, lambda obj: obj.model_dump())
+
+        def dump_json_native(obj: BaseModel) -> Any:  # noqa: ANN401 - Any required for generic JSON encoding
+            try:
+                return obj.model_dump(mode="json")
+            except (PydanticSerializationError, UnicodeDecodeError):  # arbitrary types, bytes that are not UTF-8
+                return obj.model_dump()
+
+        _PYDANTIC_JSON_HANDLERS[BaseModel] = dump_json_native
     except ImportError:
         pass
 
@@ -1,10 +1,31 @@
 """Tests for date_utils module."""
 
+import time
+from array import array
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 
 import pytest
 
-from mm_std import parse_datetime, utc_from_timestamp, utc_now, utc_now_offset
+from mm_std import (
+    DateTimeParser,
+    UtcClock,
+    ceil_datetime,
+    ceil_epoch,
+    floor_datetime,
+    floor_epoch,
+    parse_datetime,
+    parse_datetimes,
+    sliding_windows,
+    tumbling_windows,
+    utc_from_epoch,
+    utc_from_epochs,
+    utc_from_timestamp,
+    utc_now,
+    utc_now_offset,
+    utc_to_epoch,
+    utc_to_epochs,
+)
 
 
 class TestUtcNow:
@@ -70,6 +91,44 @@ class TestUtcNowOffset:
         assert before <= result <= after
 
 
+class TestUtcClock:
+    """Tests for UtcClock class."""
+
+    def test_now_is_close_to_system_time(self) -> None:
+        """now() matches datetime.now within a small tolerance."""
+        result = UtcClock(resolution=timedelta(microseconds=1)).now()
+        assert result.tzinfo == UTC
+        assert abs(result - datetime.now(UTC)) < timedelta(seconds=1)
+
+    def test_now_requires_resolution(self) -> None:
+        """Without a resolution now() raises; now_ns() gives full precision."""
+        clock = UtcClock()
+        with pytest.raises(ValueError, match=r"now\(\) requires a resolution"):
+            clock.now()
+        assert abs(clock.now_ns() - time.time_ns()) < 1_000_000_000
+
+    def test_now_ns_matches_now(self) -> None:
+        """now_ns() and now() describe the same instant."""
+        clock = UtcClock(resolution=timedelta(days=1))
+        assert utc_from_timestamp(clock.now_ns() / 1e9) == clock.now()
+
+    def test_resolution_truncates_readings(self) -> None:
+        """Readings are multiples of the resolution."""
+        clock = UtcClock(resolution=timedelta(seconds=1))
+        assert clock.now_ns() % 1_000_000_000 == 0
+        assert clock.now().microsecond == 0
+
+    def test_now_is_cached_within_a_tick(self) -> None:
+        """The same datetime object is returned until the next tick."""
+        clock = UtcClock(resolution=timedelta(days=1))
+        assert clock.now() is clock.now()
+
+    def test_non_positive_resolution_raises(self) -> None:
+        """Zero or negative resolution raises ValueError."""
+        with pytest.raises(ValueError, match="resolution must be positive"):
+            UtcClock(resolution=timedelta(0))
+
+
 class TestUtcFromTimestamp:
     """Tests for utc_from_timestamp function."""
 
@@ -96,6 +155,153 @@ class TestUtcFromTimestamp:
         assert result == datetime(1970, 1, 1, 0, 0, 0, tzinfo=UTC)
 
 
+class TestEpochConversions:
+    """Tests for integer epoch conversion functions."""
+
+    DT = datetime(2023, 12, 25, 10, 30, 45, 123456, tzinfo=UTC)
+
+    @pytest.mark.parametrize(
+        ("unit", "value"),
+        [("s", 1703500245), ("ms", 1703500245123), ("us", 1703500245123456), ("ns", 1703500245123456000)],
+    )
+    def test_to_epoch(self, unit: str, value: int) -> None:
+        """Datetime converts to the exact integer in each unit."""
+        assert utc_to_epoch(self.DT, unit) == value  # type: ignore[arg-type]
+
+    def test_from_epoch_keeps_precision(self) -> None:
+        """Large ns/us values are converted without float rounding."""
+        assert utc_from_epoch(1703500245123456789, "ns") == self.DT
+        assert utc_from_epoch(1703500245123456, "us") == self.DT
+        assert utc_from_epoch(1703500245, "s") == self.DT.replace(microsecond=0)
+
+    def test_naive_datetime_treated_as_utc(self) -> None:
+        """Naive datetimes are interpreted as UTC."""
+        assert utc_to_epoch(self.DT.replace(tzinfo=None), "us") == utc_to_epoch(self.DT, "us")
+
+    def test_pre_epoch_rounds_down(self) -> None:
+        """Values before the epoch round toward negative infinity."""
+        dt = datetime(1969, 12, 31, 23, 59, 59, 500000, tzinfo=UTC)
+        assert utc_to_epoch(dt, "s") == -1
+        assert utc_from_epoch(-500, "ms") == dt
+
+    def test_batch_round_trip(self) -> None:
+        """Batch functions round-trip through an array('q') buffer."""
+        dts = [self.DT, self.DT + timedelta(days=1), datetime(1970, 1, 1, tzinfo=UTC)]
+        for unit in ("s", "ms", "us", "ns"):
+            epochs = utc_to_epochs(dts, unit)  # type: ignore[arg-type]
+            assert isinstance(epochs, array)
+            assert epochs.typecode == "q"
+            assert list(epochs) == [utc_to_epoch(dt, unit) for dt in dts]  # type: ignore[arg-type]
+        assert utc_from_epochs(utc_to_epochs(dts, "us"), "us") == dts
+        assert utc_from_epochs(array("q", [1703500245123456789]), "ns") == [self.DT]
+
+    def test_unknown_unit_raises(self) -> None:
+        """Unknown unit raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown epoch unit"):
+            utc_from_epoch(0, "h")  # type: ignore[arg-type]
+
+
+class TestBucketing:
+    """Tests for floor/ceil functions."""
+
+    @pytest.mark.parametrize(
+        ("interval", "floor", "ceil"),
+        [
+            (
+                timedelta(seconds=1),
+                datetime(2023, 12, 25, 10, 32, 45, tzinfo=UTC),
+                datetime(2023, 12, 25, 10, 32, 46, tzinfo=UTC),
+            ),
+            (timedelta(minutes=5), datetime(2023, 12, 25, 10, 30, tzinfo=UTC), datetime(2023, 12, 25, 10, 35, tzinfo=UTC)),
+            (timedelta(hours=1), datetime(2023, 12, 25, 10, tzinfo=UTC), datetime(2023, 12, 25, 11, tzinfo=UTC)),
+            (timedelta(days=1), datetime(2023, 12, 25, tzinfo=UTC), datetime(2023, 12, 26, tzinfo=UTC)),
+        ],
+    )
+    def test_floor_and_ceil(self, interval: timedelta, floor: datetime, ceil: datetime) -> None:
+        """Datetimes are rounded to interval boundaries."""
+        dt = datetime(2023, 12, 25, 10, 32, 45, 500, tzinfo=UTC)
+        assert floor_datetime(dt, interval) == floor
+        assert ceil_datetime(dt, interval) == ceil
+
+    def test_boundary_is_unchanged(self) -> None:
+        """Values already on a boundary are returned as is."""
+        dt = datetime(2023, 12, 25, 10, 30, tzinfo=UTC)
+        assert floor_datetime(dt, timedelta(minutes=5)) == dt
+        assert ceil_datetime(dt, timedelta(minutes=5)) == dt
+
+    def test_naive_datetime(self) -> None:
+        """Naive datetimes stay naive and are aligned as UTC."""
+        result = floor_datetime(datetime(2023, 12, 25, 10, 32), timedelta(hours=1))
+        assert result == datetime(2023, 12, 25, 10)
+        assert result.tzinfo is None
+
+    def test_epoch_ints(self) -> None:
+        """Integer epochs are rounded in their own unit, including negatives."""
+        assert floor_epoch(1703500245123, 60_000) == 1703500200000
+        assert ceil_epoch(1703500245123, 60_000) == 1703500260000
+        assert ceil_epoch(1703500200000, 60_000) == 1703500200000
+        assert floor_epoch(-1, 10) == -10
+        assert ceil_epoch(-1, 10) == 0
+
+    def test_non_positive_interval_raises(self) -> None:
+        """Zero interval raises ValueError."""
+        with pytest.raises(ValueError, match="interval must be positive"):
+            floor_datetime(datetime(2023, 12, 25, tzinfo=UTC), timedelta(0))
+        with pytest.raises(ValueError, match="interval must be positive"):
+            floor_epoch(1, 0)
+
+
+class TestWindows:
+    """Tests for tumbling_windows and sliding_windows functions."""
+
+    BASE = datetime(2023, 12, 25, 10, 0, tzinfo=UTC)
+
+    def records(self, *seconds: int) -> list[tuple[datetime, int]]:
+        """Build (timestamp, value) records at given second offsets from BASE."""
+        return [(self.BASE + timedelta(seconds=offset), offset) for offset in seconds]
+
+    def test_tumbling_groups_by_window(self) -> None:
+        """Items are grouped into aligned, non-overlapping windows; empty ones are skipped."""
+        windows = tumbling_windows(self.records(0, 30, 59, 60, 200), lambda r: r[0], timedelta(minutes=1))
+        result = [(start, [value for _, value in group]) for start, group in windows]
+        assert result == [
+            (self.BASE, [0, 30, 59]),
+            (self.BASE + timedelta(minutes=1), [60]),
+            (self.BASE + timedelta(minutes=3), [200]),
+        ]
+
+    def test_tumbling_is_lazy(self) -> None:
+        """Input is consumed only as windows are requested."""
+        consumed: list[int] = []
+
+        def source() -> Iterator[tuple[datetime, int]]:
+            for record in self.records(0, 60, 120):
+                consumed.append(record[1])
+                yield record
+
+        windows = tumbling_windows(source(), lambda r: r[0], timedelta(minutes=1))
+        assert consumed == []
+        next(windows)
+        assert consumed == [0]
+
+    def test_sliding_overlapping_windows(self) -> None:
+        """Each item appears in every window that covers it."""
+        windows = sliding_windows(self.records(0, 30, 70), lambda r: r[0], timedelta(minutes=1), timedelta(seconds=30))
+        result = [(int((start - self.BASE).total_seconds()), [value for _, value in items]) for start, items in windows]
+        assert result == [(-30, [0]), (0, [0, 30]), (30, [30, 70]), (60, [70])]
+
+    def test_sliding_skips_gaps(self) -> None:
+        """Empty windows are skipped and items between windows are dropped when step > size."""
+        windows = sliding_windows(self.records(5, 15, 1000), lambda r: r[0], timedelta(seconds=10), timedelta(seconds=20))
+        result = [(int((start - self.BASE).total_seconds()), [value for _, value in items]) for start, items in windows]
+        assert result == [(0, [5]), (1000, [1000])]
+
+    def test_empty_input(self) -> None:
+        """No items produce no windows."""
+        assert list(sliding_windows([], lambda r: r, timedelta(seconds=1), timedelta(seconds=1))) == []
+        assert list(tumbling_windows([], lambda r: r, timedelta(seconds=1))) == []
+
+
 class TestParseDatetime:
     """Tests for parse_datetime function."""
 
@@ -163,3 +369,168 @@ class TestParseDatetime:
         result = parse_datetime("2023-12-25T10:30:00z")
         assert result.year == 2023
         assert result.tzinfo is not None
+
+    @pytest.mark.parametrize(
+        "date_str",
+        [
+            "2023-12-25T10:30:00",  # "T" separator is only known with seconds and timezone
+            "2023-12-25 10:30:00.1234567",  # strptime accepts at most 6 fraction digits
+            "2023-12-25 10:30:00+05",  # offset without minutes
+            "2023-12-25 10:30:00+05:60",
+            "2023-12-25 24:00:00",
+        ],
+    )
+    def test_rejects_shapes_outside_known_formats(self, date_str: str) -> None:
+        """Strings that only datetime.fromisoformat would accept are still rejected."""
+        with pytest.raises(ValueError, match="does not match any known format"):
+            parse_datetime(date_str)
+
+    def test_non_padded_fields_use_fallback(self) -> None:
+        """Shapes not recognized by length are still parsed by trying every format."""
+        assert parse_datetime("2023-1-5 9:05") == datetime(2023, 1, 5, 9, 5)
+
+    def test_short_fraction_and_compact_offset(self) -> None:
+        """Short fractions and +HHMM offsets parse like strptime does."""
+        result = parse_datetime("2023-12-25 10:30:00.12-0530")
+        assert result.microsecond == 120000
+        assert result.utcoffset() == -timedelta(hours=5, minutes=30)
+
+
+class TestDateTimeParser:
+    """Tests for DateTimeParser class."""
+
+    def test_custom_formats(self) -> None:
+        """Parses formats supplied by the caller."""
+        parser = DateTimeParser(["%d.%m.%Y", "%d.%m.%Y %H:%M"])
+        assert parser.parse("25.12.2023") == datetime(2023, 12, 25)
+        assert parser.parse("25.12.2023 10:30") == datetime(2023, 12, 25, 10, 30)
+
+    def test_formats_not_in_list_are_rejected(self) -> None:
+        """Recognized shapes are not parsed unless their format was supplied."""
+        parser = DateTimeParser(["%d.%m.%Y"])
+        with pytest.raises(ValueError, match="does not match any known format"):
+            parser.parse("2023-12-25")
+
+    def test_remembers_last_successful_format(self) -> None:
+        """The format that matched last is tried first on the next call."""
+        parser = DateTimeParser(["%Y%m%d", "%d.%m.%Y"])
+        parser.parse("25.12.2023")
+        assert parser.last_format == "%d.%m.%Y"
+        assert parser.parse("01.02.2024") == datetime(2024, 2, 1)
+        assert parser.parse("20240201") == datetime(2024, 2, 1)
+        assert parser.last_format == "%Y%m%d"
+
+    def test_z_suffix_and_ignore_tz(self) -> None:
+        """Z suffix and ignore_tz work like in parse_datetime."""
+        parser = DateTimeParser(["%d.%m.%Y %H:%M%z"])
+        assert parser.parse("25.12.2023 10:30Z").tzinfo == UTC
+        assert parser.parse("25.12.2023 10:30Z", ignore_tz=True).tzinfo is None
+
+    def test_empty_formats_raises_value_error(self) -> None:
+        """At least one format is required."""
+        with pytest.raises(ValueError, match="At least one format"):
+            DateTimeParser([])
+
+
+class TestParseDatetimes:
+    """Tests for parse_datetimes function and DateTimeParser.iter_parse."""
+
+    def test_parses_mixed_formats_in_order(self) -> None:
+        """Values in different formats are all parsed, preserving order."""
+        result = parse_datetimes(["2023-12-25", "2023-12-25 10:30", "2023-1-5", "2023/12/25"])
+        assert result == [datetime(2023, 12, 25), datetime(2023, 12, 25, 10, 30), datetime(2023, 1, 5), datetime(2023, 12, 25)]
+
+    def test_ignore_tz(self) -> None:
+        """ignore_tz applies to every value."""
+        result = parse_datetimes(["2023-12-25T10:30:00Z", "2023-12-25T10:30:00+02:00"], ignore_tz=True)
+        assert all(dt.tzinfo is None for dt in result)
+
+    def test_on_error_raise(self) -> None:
+        """Default policy raises on the first bad value."""
+        with pytest.raises(ValueError, match="does not match any known format"):
+            parse_datetimes(["2023-12-25", "bad"])
+
+    def test_on_error_none(self) -> None:
+        """Bad values become None."""
+        result = parse_datetimes(["bad", "2023-12-25"], on_error="none")
+        assert result == [None, datetime(2023, 12, 25)]
+
+    def test_on_error_collect(self) -> None:
+        """Bad values are replaced by the error describing them."""
+        result = parse_datetimes(["2023-12-25", "bad"], on_error="collect")
+        assert result[0] == datetime(2023, 12, 25)
+        assert isinstance(result[1], ValueError)
+        assert "bad" in str(result[1])
+
+    def test_unknown_policy_raises(self) -> None:
+        """Unknown on_error value raises ValueError before parsing."""
+        with pytest.raises(ValueError, match="Unknown on_error policy"):
+            DateTimeParser().iter_parse([], on_error="skip")  # type: ignore[call-overload]
+
+    def test_iter_parse_is_lazy(self) -> None:
+        """iter_parse consumes values only as results are requested."""
+        consumed: list[str] = []
+
+        def values() -> Iterator[str]:
+            for value in ["25.12.2023", "26.12.2023"]:
+                consumed.append(value)
+                yield value
+
+        results = DateTimeParser(["%d.%m.%Y"]).iter_parse(values())
+        assert consumed == []
+        assert next(results) == datetime(2023, 12, 25)
+        assert consumed == ["25.12.2023"]
+
+
+class TestDateTimeParserCache:
+    """Tests for DateTimeParser result caching."""
+
+    def test_repeated_strings_hit_cache(self) -> None:
+        """Repeated strings are served from the cache."""
+        parser = DateTimeParser(cache_size=10)
+        first = parser.parse("2023-12-25 10:30:00")
+        second = parser.parse("2023-12-25 10:30:00")
+        assert first == second
+        assert parser.cache_info() == (1, 1, 10, 1)
+
+    def test_ignore_tz_is_part_of_key(self) -> None:
+        """Same string with different ignore_tz gets separate cache entries."""
+        parser = DateTimeParser(cache_size=10)
+        aware = parser.parse("2023-12-25T10:30:00Z")
+        naive = parser.parse("2023-12-25T10:30:00Z", ignore_tz=True)
+        assert aware.tzinfo == UTC
+        assert naive.tzinfo is None
+        assert parser.cache_info().misses == 2
+
+    def test_eviction_bound(self) -> None:
+        """Cache never holds more than cache_size entries."""
+        parser = DateTimeParser(cache_size=2)
+        for day in range(1, 6):
+            parser.parse(f"2023-12-{day:02d}")
+        assert parser.cache_info().currsize == 2
+
+    def test_errors_are_not_cached(self) -> None:
+        """Unparsable strings raise every time."""
+        parser = DateTimeParser(cache_size=2)
+        for _ in range(2):
+            with pytest.raises(ValueError, match="does not match any known format"):
+                parser.parse("bad")
+        assert parser.cache_info().currsize == 0
+
+    def test_cache_clear(self) -> None:
+        """cache_clear drops entries and statistics."""
+        parser = DateTimeParser(cache_size=2)
+        parser.parse("2023-12-25")
+        parser.cache_clear()
+        assert parser.cache_info() == (0, 0, 2, 0)
+
+    def test_disabled_by_default(self) -> None:
+        """Without cache_size nothing is memoized."""
+        parser = DateTimeParser()
+        parser.parse("2023-12-25")
+        assert parser.cache_info() == (0, 0, 0, 0)
+
+    def test_negative_cache_size_raises(self) -> None:
+        """Negative cache_size raises ValueError."""
+        with pytest.raises(ValueError, match="cache_size"):
+            DateTimeParser(cache_size=-1)
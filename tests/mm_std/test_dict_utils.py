@@ -1,11 +1,28 @@
 """Tests for dict_utils module."""
 
-from collections import OrderedDict, defaultdict
+import itertools
+from collections import OrderedDict, UserDict, defaultdict
+from collections.abc import Iterator
 from decimal import Decimal
+from enum import IntEnum
+from types import MappingProxyType
 
 import pytest
 
-from mm_std import compact_dict
+from mm_std import (
+    compact_dict,
+    compact_dict_inplace,
+    compact_dicts,
+    compile_path,
+    deep_compact,
+    deep_merge,
+    flatten,
+    get_path,
+    iter_flatten,
+    make_compactor,
+    set_path,
+    unflatten,
+)
 
 
 class TestCompactDict:
@@ -196,3 +213,456 @@ class TestCompactDictEdgeCases:
         data = {"a": 0, "b": False}
         result = compact_dict(data, treat_zero_as_empty=True, treat_false_as_empty=False)
         assert result == {"b": False}
+
+
+class _Count(IntEnum):
+    NONE = 0
+    ONE = 1
+
+
+class _Name(str):
+    __slots__ = ()
+
+
+SAMPLE = {
+    "none": None,
+    "empty": "",
+    "text": "x",
+    "zero": 0,
+    "one": 1,
+    "float_zero": 0.0,
+    "decimal_zero": Decimal("0.00"),
+    "false": False,
+    "true": True,
+    "enum_zero": _Count.NONE,
+    "enum_one": _Count.ONE,
+    "str_subclass": _Name(""),
+    "list": [],
+    "dict": {},
+    "nan": float("nan"),
+}
+
+
+class TestMakeCompactor:
+    """Tests for make_compactor."""
+
+    @pytest.mark.parametrize("flags", list(itertools.product([False, True], repeat=3)))
+    def test_matches_compact_dict(self, flags: tuple[bool, bool, bool]) -> None:
+        """Every flag combination gives the same result as compact_dict, with and without defaults."""
+        zero, false, empty_string = flags
+        for defaults in (None, {"none": "N", "zero": -1, "false": True, "enum_zero": 7}):
+            options = {
+                "treat_zero_as_empty": zero,
+                "treat_false_as_empty": false,
+                "treat_empty_string_as_empty": empty_string,
+            }
+            expected = compact_dict(SAMPLE, defaults, **options)
+            result = make_compactor(defaults, **options)(SAMPLE)
+            assert list(result.items()) == list(expected.items())  # same NaN object, so equal by identity
+
+    def test_preserves_types(self) -> None:
+        """dict, OrderedDict and defaultdict keep their types and default_factory."""
+        compact = make_compactor()
+        assert type(compact({"a": None})) is dict
+        assert compact(OrderedDict([("b", 1), ("a", None), ("c", 2)])) == OrderedDict([("b", 1), ("c", 2)])
+        result = compact(defaultdict(list, {"a": None, "b": [1]}))
+        assert isinstance(result, defaultdict)
+        assert result.default_factory is list
+        assert dict(result) == {"b": [1]}
+
+    def test_does_not_modify_input(self) -> None:
+        """The input dictionary is left untouched."""
+        data = {"a": None, "b": ""}
+        make_compactor({"a": 1})(data)
+        assert data == {"a": None, "b": ""}
+
+    def test_reused_across_dicts(self) -> None:
+        """One compactor handles dicts with different value types."""
+        compact = make_compactor(treat_zero_as_empty=True)
+        assert compact({"a": 0, "b": _Count.ONE}) == {"b": _Count.ONE}
+        assert compact({"a": _Count.NONE, "b": 0.0, "c": "x"}) == {"c": "x"}
+
+
+class TestCompactDicts:
+    """Tests for compact_dicts."""
+
+    def test_compacts_each_record(self) -> None:
+        """Each record is compacted with the same options."""
+        records = [{"a": 1, "b": None}, {"a": 0, "b": ""}]
+        assert list(compact_dicts(records, {"b": "-"}, treat_zero_as_empty=True)) == [{"a": 1, "b": "-"}, {"b": "-"}]
+
+    def test_is_lazy(self) -> None:
+        """Records are pulled from the source only as results are consumed."""
+        pulled: list[int] = []
+
+        def source() -> Iterator[dict[str, int | None]]:
+            for i in range(3):
+                pulled.append(i)
+                yield {"i": i, "x": None}
+
+        results = compact_dicts(source())
+        assert pulled == []
+        assert next(results) == {"i": 0}
+        assert pulled == [0]
+
+
+class TestCompactDictInplace:
+    """Tests for compact_dict_inplace."""
+
+    @pytest.mark.parametrize("flags", list(itertools.product([False, True], repeat=3)))
+    def test_matches_compact_dict(self, flags: tuple[bool, bool, bool]) -> None:
+        """The modified dictionary equals compact_dict's result for every flag combination."""
+        defaults = {"b": "default", "zero": -1}
+        data = dict(SAMPLE)
+        compact_dict_inplace(data, defaults, *flags)
+        assert data == compact_dict(SAMPLE, defaults, *flags)
+
+    def test_modifies_same_object(self) -> None:
+        """Entries are removed and replaced on the given mapping, which keeps its type and order."""
+        data = OrderedDict([("a", None), ("b", 1), ("c", ""), ("d", 2)])
+        original = data
+        compact_dict_inplace(data, {"c": "x"})
+        assert data is original
+        assert list(data.items()) == [("b", 1), ("c", "x"), ("d", 2)]
+
+    def test_defaultdict_keeps_factory(self) -> None:
+        """A defaultdict keeps its default_factory."""
+        data: defaultdict[str, int | None] = defaultdict(int, {"a": None, "b": 1})
+        compact_dict_inplace(data)
+        assert data == {"b": 1}
+        assert data.default_factory is int
+
+    def test_compactor_method(self) -> None:
+        """DictCompactor.compact_inplace applies the compactor's options."""
+        data = {"a": 0, "b": 1, "c": None}
+        make_compactor({"c": 3}, treat_zero_as_empty=True).compact_inplace(data)
+        assert data == {"b": 1, "c": 3}
+
+
+class TestDeepCompact:
+    """Tests for deep_compact."""
+
+    def test_compacts_nested_dicts(self) -> None:
+        """Empty entries are removed at every level."""
+        data = {"a": None, "b": {"c": "", "d": {"e": None, "f": 1}}}
+        assert deep_compact(data) == {"b": {"d": {"f": 1}}}
+
+    def test_matches_compact_dict_on_flat_dict(self) -> None:
+        """A flat dictionary is compacted exactly like compact_dict."""
+        data = {"a": 0, "b": False, "c": "", "d": None, "e": Decimal(0), "f": 1}
+        for flags in itertools.product([False, True], repeat=3):
+            assert deep_compact(data, None, *flags) == compact_dict(data, None, *flags)
+
+    def test_defaults_by_path(self) -> None:
+        """Defaults are looked up by the path of keys from the root."""
+        data = {"email": None, "user": {"email": None, "name": None}}
+        result = deep_compact(data, {("user", "email"): "unknown"})
+        assert result == {"user": {"email": "unknown"}}
+
+    def test_lists_are_transparent_for_defaults(self) -> None:
+        """A default path applies to every dict inside a list."""
+        data = {"items": [{"price": None}, {"price": 5}, [{"price": None}]]}
+        result = deep_compact(data, {("items", "price"): 0})
+        assert result == {"items": [{"price": 0}, {"price": 5}, [{"price": 0}]]}
+
+    def test_list_items_are_kept(self) -> None:
+        """List items are never removed, so positions keep their meaning."""
+        data = {"values": [None, "", {}, 1]}
+        assert deep_compact(data, prune_empty_containers=True) == {"values": [None, "", {}, 1]}
+
+    def test_tuples_are_preserved(self) -> None:
+        """Tuples are rebuilt as tuples, with dicts inside compacted."""
+        data = {"pair": ({"a": None, "b": 1}, 2)}
+        result = deep_compact(data)
+        assert result == {"pair": ({"b": 1}, 2)}
+        assert isinstance(result["pair"], tuple)
+
+    def test_keeps_empty_containers_by_default(self) -> None:
+        """Containers that become empty are kept unless pruning is enabled."""
+        data = {"a": {"b": None}, "c": [], "d": ()}
+        assert deep_compact(data) == {"a": {}, "c": [], "d": ()}
+
+    def test_prune_empty_containers(self) -> None:
+        """Pruning removes containers that are or become empty, cascading upwards."""
+        data = {"a": {"b": {"c": None}}, "d": [], "e": {"f": 1}}
+        assert deep_compact(data, prune_empty_containers=True) == {"e": {"f": 1}}
+
+    def test_prune_uses_defaults(self) -> None:
+        """A pruned container is replaced by its default when one is given."""
+        data = {"a": {"b": None}}
+        assert deep_compact(data, {("a",): {"b": 0}}, prune_empty_containers=True) == {"a": {"b": 0}}
+
+    def test_preserves_nested_types(self) -> None:
+        """The root and nested dict types are preserved."""
+        inner: defaultdict[str, int | None] = defaultdict(int, {"x": None, "y": 1})
+        data = OrderedDict([("z", None), ("inner", inner)])
+        result = deep_compact(data)
+        assert type(result) is OrderedDict
+        assert type(result["inner"]) is defaultdict
+        assert result["inner"].default_factory is int
+        assert result["inner"] == {"y": 1}
+
+    def test_user_dict_root(self) -> None:
+        """A non-dict mapping root is compacted like compact_dict does, keeping its type."""
+        data = UserDict({"a": None, "b": 1})
+        result = deep_compact(data)
+        assert type(result) is UserDict
+        assert result == compact_dict(data) == {"b": 1}
+
+    def test_nested_mappings(self) -> None:
+        """Nested non-dict mappings are compacted; read-only ones become dicts."""
+        data = {
+            "user": UserDict({"a": None, "b": 1}),
+            "proxy": MappingProxyType({"c": None, "d": 2}),
+            "items": [UserDict({"e": ""})],
+        }
+        result = deep_compact(data)
+        assert result == {"user": {"b": 1}, "proxy": {"d": 2}, "items": [{}]}
+        assert type(result["user"]) is UserDict
+        assert type(result["proxy"]) is dict
+
+    def test_does_not_modify_input(self) -> None:
+        """The input and its nested containers are left unchanged."""
+        data = {"a": None, "b": {"c": None}, "d": [{"e": None}]}
+        deep_compact(data)
+        assert data == {"a": None, "b": {"c": None}, "d": [{"e": None}]}
+
+    def test_shared_containers_are_not_cycles(self) -> None:
+        """The same object appearing twice in different branches is compacted in both."""
+        shared = {"a": None, "b": 1}
+        assert deep_compact({"x": shared, "y": [shared, shared]}) == {"x": {"b": 1}, "y": [{"b": 1}, {"b": 1}]}
+
+    def test_cycle_raises(self) -> None:
+        """A container that contains itself raises ValueError with the path."""
+        data: dict[str, object] = {"a": {}}
+        data["a"] = {"items": [data]}
+        with pytest.raises(ValueError, match="Cycle detected at path"):
+            deep_compact(data)
+
+    def test_deep_nesting(self) -> None:
+        """Nesting far beyond the recursion limit is handled."""
+        data: dict[str, object] = {"leaf": 1, "empty": None}
+        for _ in range(10_000):
+            data = {"child": data, "empty": None}
+        result = deep_compact(data)
+        for _ in range(10_000):
+            assert list(result) == ["child"]
+            result = result["child"]
+        assert result == {"leaf": 1}
+
+
+DOC = {"a": {"b": [{"c": 1}, {"c": None, "d": {}}], "e": ()}, "f": "x"}
+
+
+class TestCompilePath:
+    """Tests for compile_path."""
+
+    def test_bracket_and_dotted_indices_are_equal(self) -> None:
+        """List indices may be written as [n] or as a digit segment."""
+        assert compile_path("a.b[0].c").segments == ("a", "b", 0, "c")
+        assert compile_path("a.b.0.c").segments == ("a", "b", 0, "c")
+        assert compile_path("[0][1].x").segments == (0, 1, "x")
+
+    def test_is_cached(self) -> None:
+        """The same path string returns the same compiled object."""
+        assert compile_path("a.b.c") is compile_path("a.b.c")
+
+    @pytest.mark.parametrize("path", ["", "a..b", ".a", "a.", "a[x]", "a]", "a[0]b", "a.[0]"])
+    def test_invalid_paths(self, path: str) -> None:
+        """Empty segments and malformed brackets raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid path"):
+            compile_path(path)
+
+
+class TestGetPath:
+    """Tests for get_path."""
+
+    def test_reads_nested_values(self) -> None:
+        """Keys and list indices are followed through the document."""
+        assert get_path(DOC, "a.b[0].c") == 1
+        assert get_path(DOC, "a.b.1.d") == {}
+        assert get_path(DOC, "f") == "x"
+
+    def test_missing_returns_default(self) -> None:
+        """Missing keys, out of range indices and scalars in the way return the default."""
+        assert get_path(DOC, "a.x.y") is None
+        assert get_path(DOC, "a.b[5].c", "-") == "-"
+        assert get_path(DOC, "f.g", "-") == "-"
+        assert get_path(DOC, "a.b.c", "-") == "-"
+
+    def test_stored_none_is_returned(self) -> None:
+        """A stored None is returned rather than the default."""
+        assert get_path(DOC, "a.b[1].c", "-") is None
+
+    def test_digit_keys_in_dicts(self) -> None:
+        """Digit segments match string and integer dictionary keys."""
+        assert get_path({"a": {"0": "s"}}, "a.0") == "s"
+        assert get_path({"a": {0: "i"}}, "a[0]") == "i"
+
+    def test_tuples(self) -> None:
+        """Tuples are indexed like lists."""
+        assert get_path({"a": ({"b": 2},)}, "a[0].b") == 2
+
+
+class TestSetPath:
+    """Tests for set_path."""
+
+    def test_creates_missing_containers(self) -> None:
+        """Missing dicts and lists are created, and lists are padded with None."""
+        data: dict[str, object] = {}
+        set_path(data, "x.y[2].z", 5)
+        set_path(data, "x.w", 1)
+        assert data == {"x": {"y": [None, None, {"z": 5}], "w": 1}}
+
+    def test_overwrites_existing_values(self) -> None:
+        """Existing keys and list items are replaced."""
+        data = {"a": {"b": [1, 2]}}
+        set_path(data, "a.b[1]", 3)
+        set_path(data, "a.b.2", 4)
+        assert data == {"a": {"b": [1, 3, 4]}}
+
+    def test_scalar_in_the_way_raises(self) -> None:
+        """Setting below a non-container value raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot set"):
+            set_path({"a": 1}, "a.b", 2)
+        with pytest.raises(ValueError, match="Cannot set"):
+            set_path({"a": [1]}, "a.b", 2)
+
+    def test_roundtrip_with_get_path(self) -> None:
+        """A value written with set_path is read back by get_path."""
+        data: dict[str, object] = {}
+        set_path(data, "a[0].b.c", "v")
+        assert get_path(data, "a.0.b.c") == "v"
+
+
+class TestFlatten:
+    """Tests for flatten and iter_flatten."""
+
+    def test_flattens_nested_document(self) -> None:
+        """Leaves are keyed by joined paths; empty containers are kept as leaves."""
+        assert flatten(DOC) == {"a.b.0.c": 1, "a.b.1.c": None, "a.b.1.d": {}, "a.e": (), "f": "x"}
+
+    def test_custom_separator_and_key_types(self) -> None:
+        """Non-string keys are converted with str and joined with the separator."""
+        assert flatten({1: {"b": [True]}}, sep="/") == {"1/b/0": True}
+
+    def test_is_lazy(self) -> None:
+        """iter_flatten yields leaves in depth-first key order."""
+        items = iter_flatten({"a": {"b": 1}, "c": 2})
+        assert next(items) == ("a.b", 1)
+        assert list(items) == [("c", 2)]
+
+    def test_cycle_raises(self) -> None:
+        """A container that contains itself raises ValueError."""
+        data: dict[str, object] = {}
+        data["self"] = [data]
+        with pytest.raises(ValueError, match=r"Cycle detected at path 'self\.0'"):
+            flatten(data)
+
+    def test_deep_nesting(self) -> None:
+        """Nesting far beyond the recursion limit is handled."""
+        data: dict[str, object] = {"leaf": 1}
+        for _ in range(5_000):
+            data = {"n": data}
+        assert flatten(data) == {"n." * 5_000 + "leaf": 1}
+
+
+class TestUnflatten:
+    """Tests for unflatten."""
+
+    def test_inverts_flatten(self) -> None:
+        """Flattened documents are restored, lists included."""
+        doc = {"a": {"b": [{"c": 1}, {"c": None, "d": {}}], "e": []}, "f": "x"}
+        assert unflatten(flatten(doc)) == doc
+
+    def test_accepts_pairs(self) -> None:
+        """A stream of pairs is accepted, and sparse lists are padded with None."""
+        assert unflatten(iter([("a/1", "x"), ("b", 2)]), sep="/") == {"a": [None, "x"], "b": 2}
+
+    @pytest.mark.parametrize("items", [{"a": 1, "a.b": 2}, {"a.b": 2, "a": 1}])
+    def test_leaf_and_container_conflict(self, items: dict[str, int]) -> None:
+        """A path used both as a value and as a container raises ValueError."""
+        with pytest.raises(ValueError, match="both a value and a container"):
+            unflatten(items)
+
+    def test_list_with_key_raises(self) -> None:
+        """A non-digit key under a list raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot set"):
+            unflatten({"a.0": 1, "a.x": 2})
+
+
+class TestDeepMerge:
+    """Tests for deep_merge."""
+
+    def test_merges_nested_dicts(self) -> None:
+        """Nested dicts are merged and later overrides win."""
+        base = {"a": {"b": 1, "c": {"d": 2}}, "x": 1}
+        result = deep_merge(base, {"a": {"c": {"e": 3}}}, {"a": {"c": {"d": 9}}, "x": None})
+        assert result == {"a": {"b": 1, "c": {"d": 9, "e": 3}}, "x": None}
+
+    def test_does_not_modify_inputs(self) -> None:
+        """Neither the base nor the overrides are changed."""
+        base = {"a": {"b": 1}, "l": [1]}
+        first = {"a": {"c": 2}, "l": [2]}
+        second = {"a": {"d": 3}, "l": [3]}
+        deep_merge(base, first, second, strategy="append")
+        assert base == {"a": {"b": 1}, "l": [1]}
+        assert first == {"a": {"c": 2}, "l": [2]}
+        assert second == {"a": {"d": 3}, "l": [3]}
+
+    def test_shares_untouched_subtrees(self) -> None:
+        """Sub-trees no override touches are shared, not copied."""
+        base = {"kept": {"deep": [1, 2]}, "changed": {"a": 1}}
+        override = {"changed": {"b": 2}, "new": {"c": 3}}
+        result = deep_merge(base, override)
+        assert result["kept"] is base["kept"]
+        assert result["new"] is override["new"]
+        assert result["changed"] is not base["changed"]
+
+    def test_replace_is_default_list_strategy(self) -> None:
+        """Lists and other non-dict values are replaced by default."""
+        assert deep_merge({"l": [1, 2], "t": (1,)}, {"l": [3], "t": (2,)}) == {"l": [3], "t": (2,)}
+
+    def test_append(self) -> None:
+        """The append strategy concatenates lists across all overrides."""
+        assert deep_merge({"l": [1, 2]}, {"l": [2]}, {"l": [3]}, strategy="append") == {"l": [1, 2, 2, 3]}
+
+    def test_unique(self) -> None:
+        """The unique strategy skips items already present, including unhashable ones."""
+        result = deep_merge({"l": [1, [2], {"a": 1}]}, {"l": [1, 3, [2], {"a": 1}, {"a": 2}]}, strategy="unique")
+        assert result == {"l": [1, [2], {"a": 1}, 3, {"a": 2}]}
+
+    def test_unique_key(self) -> None:
+        """With unique_key, dict items with the same key value are replaced in place."""
+        base = {"users": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]}
+        override = {"users": [{"id": 1, "name": "A"}, {"id": 3, "name": "c"}, {"name": "no id"}]}
+        result = deep_merge(base, override, strategy="unique", unique_key="id")
+        assert result == {"users": [{"id": 1, "name": "A"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}, {"name": "no id"}]}
+
+    def test_dict_over_scalar_replaces(self) -> None:
+        """A dict replaces a scalar and a scalar replaces a dict."""
+        assert deep_merge({"a": 1, "b": {"c": 1}}, {"a": {"x": 1}, "b": 2}) == {"a": {"x": 1}, "b": 2}
+
+    def test_preserves_types(self) -> None:
+        """The base type and nested dict types are preserved, including default_factory."""
+        inner = OrderedDict([("a", 1)])
+        base: defaultdict[str, object] = defaultdict(list, {"x": inner})
+        result = deep_merge(base, {"x": {"b": 2}})
+        assert type(result) is defaultdict
+        assert result.default_factory is list
+        assert type(result["x"]) is OrderedDict
+        assert list(result["x"].items()) == [("a", 1), ("b", 2)]
+
+    def test_no_overrides_returns_copy(self) -> None:
+        """Without overrides the result is a shallow copy of the base."""
+        base = {"a": {"b": 1}}
+        result = deep_merge(base)
+        assert result == base
+        assert result is not base
+
+    def test_invalid_arguments(self) -> None:
+        """Unknown strategies and unique_key without the unique strategy raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            deep_merge({}, {}, strategy="merge")  # type: ignore[arg-type]
+        with pytest.raises(ValueError, match="unique_key requires"):
+            deep_merge({}, {}, unique_key="id")
@@ -1,17 +1,35 @@
 """Tests for json_utils module."""
 
+import base64
+import io
 import json
+import threading
+from abc import ABC
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
-from enum import Enum
+from enum import Enum, IntEnum
 from pathlib import Path
+from types import SimpleNamespace
+from typing import ClassVar
 from uuid import UUID
 
 import pydantic
 import pytest
 
-from mm_std import ExtendedJSONEncoder, json_dumps
+from mm_std import (
+    ExtendedJSONDecoder,
+    ExtendedJSONEncoder,
+    iter_json_chunks,
+    iter_json_lines,
+    json_dump_lines,
+    json_dump_stream,
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+    json_utils,
+)
 
 
 class TestExtendedJSONEncoderBuiltinTypes:
@@ -110,7 +128,7 @@ class TestExtendedJSONEncoderDataclass:
     """Tests for dataclass serialization."""
 
     def test_simple_dataclass(self) -> None:
-        """Dataclass is serialized via asdict."""
+        """Dataclass is serialized to a dict of its fields."""
 
         @dataclass
         class User:
@@ -152,6 +170,50 @@ class TestExtendedJSONEncoderDataclass:
         data = json.loads(result)
         assert data == {"id": "12345678-1234-5678-1234-567812345678", "timestamp": "2024-01-15T10:30:00"}
 
+    def test_slots_dataclass(self) -> None:
+        """Dataclasses with __slots__ are supported."""
+
+        @dataclass(slots=True)
+        class Point:
+            x: int
+            y: int
+
+        assert json_dumps(Point(1, 2)) == '{"x": 1, "y": 2}'
+        assert json_dumps(Point(1, 2), mode="precompute") == '{"x": 1, "y": 2}'
+
+    def test_empty_and_single_field_dataclass(self) -> None:
+        """Dataclasses with zero or one field are serialized too."""
+
+        @dataclass
+        class Empty:
+            pass
+
+        @dataclass
+        class Single:
+            value: int
+
+        assert json_dumps([Empty(), Single(1)]) == '[{}, {"value": 1}]'
+
+    def test_fields_are_not_copied(self) -> None:
+        """Field values are passed to the encoder as is, without asdict deep copies."""
+
+        @dataclass
+        class Bag:
+            items: list[int]
+
+        bag = Bag(items=[1, 2])
+        assert ExtendedJSONEncoder().default(bag)["items"] is bag.items
+
+    def test_registered_handler_takes_precedence(self) -> None:
+        """A handler registered for a dataclass type is used instead of its fields."""
+
+        @dataclass
+        class Token:
+            secret: str
+
+        assert json_dumps(Token("x"), type_handlers={Token: lambda _: "***"}) == '"***"'
+        assert json_dumps(Token("x")) == '{"secret": "x"}'
+
 
 class TestExtendedJSONEncoderPydantic:
     """Tests for pydantic model serialization."""
@@ -185,6 +247,46 @@ class TestExtendedJSONEncoderRegister:
         result = json.dumps(cid, cls=ExtendedJSONEncoder)
         assert result == '"id-42"'
 
+    def test_most_specific_handler_wins(self) -> None:
+        """Handler registered for a subclass takes precedence over the base class one."""
+
+        class Base:
+            pass
+
+        class Child(Base):
+            pass
+
+        ExtendedJSONEncoder.register(Child, lambda _: "child")
+        ExtendedJSONEncoder.register(Base, lambda _: "base")
+        assert json.dumps([Base(), Child()], cls=ExtendedJSONEncoder) == '["base", "child"]'
+
+    def test_register_invalidates_resolved_handlers(self) -> None:
+        """Registering a type after it was encoded replaces the cached resolution."""
+
+        class Base:
+            pass
+
+        class Child(Base):
+            pass
+
+        ExtendedJSONEncoder.register(Base, lambda _: "base")
+        assert json.dumps(Child(), cls=ExtendedJSONEncoder) == '"base"'
+        ExtendedJSONEncoder.register(Child, lambda _: "child")
+        assert json.dumps(Child(), cls=ExtendedJSONEncoder) == '"child"'
+
+    def test_virtual_subclass(self) -> None:
+        """Types registered on an ABC also apply to its virtual subclasses."""
+
+        class Marker(ABC):  # noqa: B024 - used only for virtual subclass registration
+            pass
+
+        class Impl:
+            pass
+
+        Marker.register(Impl)
+        ExtendedJSONEncoder.register(Marker, lambda _: "marker")
+        assert json.dumps(Impl(), cls=ExtendedJSONEncoder) == '"marker"'
+
     @pytest.mark.parametrize(
         "builtin_type",
         [str, int, float, bool, list, dict, type(None)],
@@ -196,6 +298,185 @@ class TestExtendedJSONEncoderRegister:
             ExtendedJSONEncoder.register(builtin_type, str)
 
 
+class TestExtendedJSONEncoderScoping:
+    """Tests for per-instance handlers, subclass registries and concurrent registration."""
+
+    def test_instance_handlers(self) -> None:
+        """Handlers passed to the constructor apply to that encoder only."""
+
+        class Secret:
+            pass
+
+        encoder = ExtendedJSONEncoder(type_handlers={Secret: lambda _: "***", Decimal: float})
+        assert encoder.encode([Secret(), Decimal("1.5")]) == '["***", 1.5]'
+        assert json_dumps(Decimal("1.5")) == '"1.5"'
+        with pytest.raises(TypeError):
+            json_dumps(Secret())
+
+    def test_instance_handlers_through_json_dumps(self) -> None:
+        """json.dumps forwards type_handlers to the encoder."""
+        assert json.dumps(Decimal("1.5"), cls=ExtendedJSONEncoder, type_handlers={Decimal: float}) == "1.5"
+
+    def test_subclass_registry_is_layered(self) -> None:
+        """A subclass registration stays in the subclass, and later base registrations reach it."""
+
+        class First:
+            pass
+
+        class Second:
+            pass
+
+        class ApiEncoder(ExtendedJSONEncoder):
+            pass
+
+        ApiEncoder.register(First, lambda _: "first")
+        ExtendedJSONEncoder.register(Second, lambda _: "second")
+        assert json.dumps([First(), Second()], cls=ApiEncoder) == '["first", "second"]'
+        with pytest.raises(TypeError):
+            json_dumps(First())
+
+    def test_subclass_handlers_in_body(self) -> None:
+        """Handlers declared in a subclass body override inherited ones."""
+
+        class FloatEncoder(ExtendedJSONEncoder):
+            _type_handlers: ClassVar = {Decimal: float}
+
+        assert json.dumps([Decimal("1.5"), UUID(int=1)], cls=FloatEncoder) == '[1.5, "00000000-0000-0000-0000-000000000001"]'
+
+    def test_register_while_encoding(self) -> None:
+        """Registering from one thread while others encode never breaks the encoders."""
+
+        class Marker(ABC):  # noqa: B024 - resolved through the issubclass fallback
+            pass
+
+        class Virtual:
+            pass
+
+        Marker.register(Virtual)
+        ExtendedJSONEncoder.register(Marker, lambda _: "virtual")
+        stop = threading.Event()
+        errors: list[BaseException] = []
+
+        def encode() -> None:
+            while not stop.is_set():
+                try:
+                    assert json_dumps([Virtual(), Decimal(1)], type_handlers={UUID: str}) == '["virtual", "1"]'
+                except BaseException as exc:
+                    errors.append(exc)
+                    return
+
+        threads = [threading.Thread(target=encode) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(300):
+                ExtendedJSONEncoder.register(type("Extra", (), {}), str)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        assert errors == []
+
+
+class TestSerializationCache:
+    """Tests for types registered with cacheable=True."""
+
+    def test_cached_objects_hit(self) -> None:
+        """Repeated objects of a cacheable type are converted once."""
+
+        @dataclass(frozen=True)
+        class Config:
+            name: str
+            created: datetime
+
+        calls: list[object] = []
+        ExtendedJSONEncoder.register(Config, cacheable=True)
+        ExtendedJSONEncoder.register(datetime, lambda obj: calls.append(obj) or obj.isoformat())
+        try:
+            config = Config("prod", datetime(2024, 1, 15))
+            expected = '{"a": {"name": "prod", "created": "2024-01-15T00:00:00"}, "b": 1}'
+            for mode in ("default", "precompute", "default"):
+                assert json_dumps({"a": config, "b": 1}, mode=mode) == expected  # type: ignore[arg-type]
+            info = ExtendedJSONEncoder.cache_info()
+            assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+            assert info.hit_rate == pytest.approx(2 / 3)
+            assert len(calls) == 1
+        finally:
+            ExtendedJSONEncoder.register(datetime, lambda obj: obj.isoformat())
+
+    def test_keyed_by_identity(self) -> None:
+        """Equal but distinct objects are converted separately."""
+
+        @dataclass(frozen=True)
+        class Pair:
+            a: object
+
+        ExtendedJSONEncoder.register(Pair, cacheable=True)
+        assert json_dumps([Pair(1), Pair(1.0), Pair(True)]) == '[{"a": 1}, {"a": 1.0}, {"a": true}]'
+        assert ExtendedJSONEncoder.cache_info().misses == 3
+
+    def test_unhashable_objects_are_cached(self) -> None:
+        """Identity keys work for objects without __hash__."""
+
+        class Settings:
+            __hash__ = None  # type: ignore[assignment]
+
+        ExtendedJSONEncoder.register(Settings, lambda _: {"debug": False}, cacheable=True)
+        settings = Settings()
+        assert json_dumps([settings, settings]) == '[{"debug": false}, {"debug": false}]'
+        assert ExtendedJSONEncoder.cache_info().hits == 1
+
+    def test_bounded(self) -> None:
+        """The cache never grows past maxsize."""
+
+        class Token:
+            pass
+
+        ExtendedJSONEncoder.register(Token, lambda _: "t", cacheable=True)
+        maxsize = ExtendedJSONEncoder.cache_info().maxsize
+        json_dumps([Token() for _ in range(maxsize + 10)])
+        assert ExtendedJSONEncoder.cache_info().currsize == maxsize
+
+    def test_uncached_types_do_not_count(self) -> None:
+        """Types that are not marked cacheable bypass the cache."""
+        ExtendedJSONEncoder.cache_clear()
+        json_dumps([Decimal("1.0"), UUID(int=1)])
+        assert ExtendedJSONEncoder.cache_info() == (0, 0, 4096, 0)
+
+    def test_register_clears_cache(self) -> None:
+        """Registering a handler drops cached values built with the previous handlers."""
+
+        class Flag:
+            pass
+
+        flag = Flag()
+        ExtendedJSONEncoder.register(Flag, lambda _: "old", cacheable=True)
+        assert json_dumps(flag) == '"old"'
+        ExtendedJSONEncoder.register(Flag, lambda _: "new")
+        assert json_dumps(flag) == '"new"'
+
+    def test_per_call_handlers_are_cached_separately(self) -> None:
+        """Per-call handlers produce their own cached values."""
+
+        class Mode:
+            pass
+
+        mode = Mode()
+        ExtendedJSONEncoder.register(Mode, lambda _: "global", cacheable=True)
+        assert json_dumps(mode) == '"global"'
+        assert json_dumps(mode, {Mode: lambda _: "local"}) == '"local"'
+        assert json_dumps(mode) == '"global"'
+
+    def test_marking_requires_cacheable(self) -> None:
+        """Omitting the handler is only allowed when marking a type cacheable."""
+
+        class Plain:
+            pass
+
+        with pytest.raises(ValueError, match="handler is required"):
+            ExtendedJSONEncoder.register(Plain)
+
+
 class TestJsonDumps:
     """Tests for json_dumps function."""
 
@@ -220,6 +501,37 @@ class TestJsonDumps:
         assert parsed == {"amount": 99.99}
         assert isinstance(parsed["amount"], float)
 
+    def test_type_handlers_reuse_encoder(self) -> None:
+        """Repeated calls with the same handlers don't create new encoder classes."""
+        handlers = {Decimal: float}
+        json_dumps(Decimal("1.5"), type_handlers=handlers)
+        before = len(ExtendedJSONEncoder.__subclasses__())
+        for _ in range(10):
+            assert json_dumps(Decimal("1.5"), type_handlers=handlers) == "1.5"
+        assert len(ExtendedJSONEncoder.__subclasses__()) <= before
+
+    def test_type_handlers_see_later_registrations(self) -> None:
+        """Types registered after a cached per-call encoder was built are still handled."""
+
+        class Late:
+            pass
+
+        handlers = {Decimal: float}
+        json_dumps(Decimal("1.5"), type_handlers=handlers)
+        ExtendedJSONEncoder.register(Late, lambda _: "late")
+        assert json_dumps([Late(), Decimal("1.5")], type_handlers=handlers) == '["late", 1.5]'
+
+    def test_unhashable_type_handler(self) -> None:
+        """Unhashable handlers still work, without caching."""
+
+        class Handler:
+            __hash__ = None  # type: ignore[assignment]
+
+            def __call__(self, obj: Decimal) -> float:
+                return float(obj)
+
+        assert json_dumps(Decimal("1.5"), type_handlers={Decimal: Handler()}) == "1.5"
+
     def test_kwargs_passed_to_json_dumps(self) -> None:
         """Additional kwargs are passed to json.dumps."""
         data = {"b": 2, "a": 1}
@@ -231,3 +543,607 @@ class TestJsonDumps:
         data = {"key": "value"}
         result = json_dumps(data, indent=2)
         assert result == '{\n  "key": "value"\n}'
+
+
+@dataclass
+class _Point:
+    x: int
+    y: Decimal
+
+
+class _Color(Enum):
+    RED = "red"
+
+
+class _Level(IntEnum):
+    HIGH = 10
+
+
+class _FloatLevel(Enum):
+    TINY = 1e-05
+
+
+class _Opaque:
+    pass
+
+
+class _Address(pydantic.BaseModel):
+    city: str
+    fee: Decimal
+
+
+class _Order(pydantic.BaseModel):
+    id: UUID
+    created: datetime
+    day: date
+    total: Decimal
+    tags: set[str]
+    color: _Color
+    address: _Address
+    items: list[_Address]
+    note: str | None = None
+
+
+class _Blob(pydantic.BaseModel):
+    data: bytes
+
+
+class TestJsonDumpsPydanticMode:
+    """Tests for pydantic_mode="json", which must match the default model encoding."""
+
+    ORDER = _Order(
+        id=UUID("12345678-1234-5678-1234-567812345678"),
+        created=datetime(2024, 1, 15, 10, 30, 0, 123456),
+        day=date(2024, 1, 15),
+        total=Decimal("19.90"),
+        tags={"a"},
+        color=_Color.RED,
+        address=_Address(city="NYC", fee=Decimal("1.50")),
+        items=[_Address(city="LA", fee=Decimal("2.00"))],
+    )
+
+    @pytest.mark.parametrize("mode", ["default", "precompute"])
+    def test_parity_with_python_mode(self, mode: str) -> None:
+        """Output matches the model_dump() based encoding."""
+        payload = {"orders": [self.ORDER, self.ORDER], "count": 2}
+        expected = json_dumps(payload, mode=mode)  # type: ignore[arg-type]
+        assert json_dumps(payload, mode=mode, pydantic_mode="json") == expected  # type: ignore[arg-type]
+        assert json_dumps_bytes(payload, mode=mode, pydantic_mode="json") == expected.encode()  # type: ignore[arg-type]
+
+    def test_model_specific_handler_wins(self) -> None:
+        """A handler registered for a model subclass takes precedence over pydantic_mode."""
+        assert json_dumps(self.ORDER.address, {_Address: lambda obj: obj.city}, pydantic_mode="json") == '"NYC"'
+
+    def test_arbitrary_types_fall_back_to_python_mode(self) -> None:
+        """Fields pydantic cannot serialize itself are left to the encoder."""
+
+        class Holder(pydantic.BaseModel):
+            model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+            value: _Opaque
+
+        result = json_dumps(Holder(value=_Opaque()), {_Opaque: lambda _: "opaque"}, pydantic_mode="json")
+        assert result == '{"value": "opaque"}'
+
+    def test_bytes_mode_applies_to_model_fields(self) -> None:
+        """With a bytes_mode, model bytes fields are encoded by it, as in pydantic_mode="python"."""
+        model = _Blob(data="\u00e9".encode())
+        for bytes_mode in ("base64", "base85", "hex"):
+            expected = json_dumps(model, bytes_mode=bytes_mode)  # type: ignore[arg-type]
+            assert json_dumps(model, pydantic_mode="json", bytes_mode=bytes_mode) == expected  # type: ignore[arg-type]
+        assert json_dumps(model, pydantic_mode="json", bytes_mode="base64") == '{"data": "w6k="}'
+
+    def test_bytes_fields_are_decoded_as_utf8(self) -> None:
+        """With the default bytes_mode, pydantic decodes bytes fields as UTF-8 rather than latin-1."""
+        model = _Blob(data="\u00e9".encode())
+        assert json_dumps(model) == '{"data": "\\u00c3\\u00a9"}'
+        assert json_dumps(model, pydantic_mode="json") == '{"data": "\\u00e9"}'
+
+    def test_non_utf8_bytes_fall_back_to_python_mode(self) -> None:
+        """Bytes pydantic cannot decode are encoded from model_dump() instead of raising."""
+        model = _Blob(data=b"\xff")
+        assert json_dumps(model, pydantic_mode="json") == json_dumps(model) == '{"data": "\\u00ff"}'
+
+    def test_unknown_pydantic_mode_raises(self) -> None:
+        """An unknown pydantic_mode raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown pydantic_mode: fast"):
+            json_dumps({}, pydantic_mode="fast")  # type: ignore[arg-type]
+
+
+class TestJsonDumpsPrecompute:
+    """Tests for json_dumps precompute mode."""
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"a": 1, "b": [1, 2.5, "x", None, True]},
+            {"id": UUID("12345678-1234-5678-1234-567812345678"), "amount": Decimal("99.99"), "when": date(2024, 1, 15)},
+            [{"tags": {Decimal("1.5")}, "path": Path("/tmp")}, (1, datetime(2024, 1, 15, 10, 30))],
+            {"point": _Point(1, Decimal("2.5")), "color": _Color.RED, "level": _Level.HIGH},
+            {"nested": {"deep": [[{"c": complex(1, 2)}]]}, 5: "int key"},
+        ],
+    )
+    def test_matches_default_mode(self, payload: object) -> None:
+        """Precompute mode produces exactly the same JSON as the default mode."""
+        assert json_dumps(payload, mode="precompute") == json_dumps(payload)
+        assert json_dumps(payload, mode="precompute", indent=2) == json_dumps(payload, indent=2)
+
+    def test_type_handlers(self) -> None:
+        """Per-call handlers apply in precompute mode."""
+        assert json_dumps([Decimal("1.5")], type_handlers={Decimal: float}, mode="precompute") == "[1.5]"
+
+    def test_input_is_not_modified(self) -> None:
+        """Containers are copied when values are converted, never changed in place."""
+        data = {"amount": Decimal("1.5"), "items": [UUID(int=1)]}
+        json_dumps(data, mode="precompute")
+        assert data == {"amount": Decimal("1.5"), "items": [UUID(int=1)]}
+
+    def test_unsupported_type_raises_type_error(self) -> None:
+        """Objects without a handler raise TypeError like json.dumps does."""
+        with pytest.raises(TypeError, match="Object of type object is not JSON serializable"):
+            json_dumps({"a": object()}, mode="precompute")
+
+    @pytest.mark.parametrize("mode", ["default", "precompute"])
+    def test_circular_reference_raises_value_error(self, mode: str) -> None:
+        """Self-referencing containers raise ValueError like json.dumps does."""
+        data: dict[str, object] = {"amount": Decimal("1.5")}
+        data["items"] = [{"parent": data}]
+        with pytest.raises(ValueError, match="Circular reference detected"):
+            json_dumps(data, mode=mode)  # type: ignore[arg-type]
+
+    def test_circular_reference_through_handler(self) -> None:
+        """A handler that returns its own input raises ValueError instead of recursing."""
+        with pytest.raises(ValueError, match="Circular reference detected"):
+            json_dumps([_Opaque()], type_handlers={_Opaque: lambda o: [o]}, mode="precompute")
+
+    def test_shared_objects_are_not_circular(self) -> None:
+        """The same container appearing twice is not a cycle."""
+        shared = [Decimal(1)]
+        assert json_dumps({"a": shared, "b": shared}, mode="precompute") == '{"a": ["1"], "b": ["1"]}'
+
+    def test_check_circular_false(self) -> None:
+        """With check_circular=False, cycles hit the recursion limit like json.dumps does."""
+        data: list[object] = []
+        data.append(data)
+        with pytest.raises(RecursionError):
+            json_dumps(data, mode="precompute", check_circular=False)
+
+    def test_unknown_mode_raises_value_error(self) -> None:
+        """Unknown mode raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown mode"):
+            json_dumps({}, mode="fast")  # type: ignore[arg-type]
+
+
+class TestJsonDumpsCanonical:
+    """Tests for mode="canonical"."""
+
+    def test_sorted_compact_utf8(self) -> None:
+        """Keys are sorted at every level, without whitespace and with raw UTF-8 text."""
+        data = {"b": 1, "a": {"z": [{"y": 1, "x": 2}], "caf\u00e9": "\u00e9"}}
+        assert json_dumps(data, mode="canonical") == '{"a":{"caf\u00e9":"\u00e9","z":[{"x":2,"y":1}]},"b":1}'
+
+    def test_insertion_order_does_not_matter(self) -> None:
+        """Dicts with the same items in a different order encode identically."""
+        first = json_dumps([{"a": 1, "b": 2}, {"b": 2, "a": 1}], mode="canonical")
+        assert first == '[{"a":1,"b":2},{"a":1,"b":2}]'
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (Decimal("1.50"), '"1.5"'),
+            (Decimal("15E-1"), '"1.5"'),
+            (Decimal("1E+2"), '"100"'),
+            (Decimal("-0.00"), '"0"'),
+            (Decimal("1.00000000000000000000000000000001"), '"1.00000000000000000000000000000001"'),
+            (1.0, "1"),
+            (-0.0, "0"),
+            (0.1, "0.1"),
+            (1e300, "1e+300"),
+            (True, "true"),
+        ],
+    )
+    def test_normalized_numbers(self, value: object, expected: str) -> None:
+        """Decimals lose exponents and trailing zeros, integral floats become integers."""
+        assert json_dumps(value, mode="canonical") == expected
+
+    def test_extended_types(self) -> None:
+        """Registered handlers, dataclasses and enums are encoded as usual."""
+        data = {"p": _Point(1, Decimal("2.50")), "c": _Color.RED, "l": _Level.HIGH, "s": (1, 2)}
+        assert json_dumps(data, mode="canonical") == '{"c":"red","l":10,"p":{"x":1,"y":"2.5"},"s":[1,2]}'
+
+    def test_per_call_decimal_handler_wins(self) -> None:
+        """A per-call Decimal handler replaces the canonical Decimal format."""
+        assert json_dumps(Decimal("2.50"), {Decimal: float}, mode="canonical") == "2.5"
+
+    def test_bytes_output(self) -> None:
+        """json_dumps_bytes returns canonical UTF-8 for hashing."""
+        assert json_dumps_bytes({"b": "\u00e9", "a": 1}, mode="canonical") == '{"a":1,"b":"\u00e9"}'.encode()
+
+    def test_non_str_keys_raise(self) -> None:
+        """Keys that the json module would coerce to str are rejected."""
+        with pytest.raises(TypeError, match="requires str keys, got int"):
+            json_dumps({1: "a"}, mode="canonical")
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), Decimal("NaN")])
+    def test_non_finite_numbers_raise(self, value: object) -> None:
+        """NaN and infinity have no canonical form."""
+        with pytest.raises(ValueError):
+            json_dumps([value], mode="canonical")
+
+    def test_options_rejected(self) -> None:
+        """Canonical mode fixes the json.dumps options."""
+        with pytest.raises(ValueError, match=r"does not accept json\.dumps options: indent"):
+            json_dumps({}, mode="canonical", indent=2)
+
+    def test_circular_reference_raises_value_error(self) -> None:
+        """Self-referencing containers and handlers raise ValueError like the other modes."""
+        data: list[object] = []
+        data.append(data)
+        with pytest.raises(ValueError, match="Circular reference detected"):
+            json_dumps(data, mode="canonical")
+        with pytest.raises(ValueError, match="Circular reference detected"):
+            json_dumps(_Opaque(), {_Opaque: lambda o: {"self": o}}, mode="canonical")
+
+    def test_shared_objects_are_not_circular(self) -> None:
+        """The same container appearing twice is not a cycle."""
+        shared = {"b": 1.0}
+        assert json_dumps([shared, shared], mode="canonical") == '[{"b":1},{"b":1}]'
+
+
+class TestJsonDumpsBytes:
+    """Tests for bytes_mode and json_dumps_bytes."""
+
+    DATA = b"\x00\xffhi"
+
+    def test_bytes_like_types_default_to_latin1(self) -> None:
+        """Bytearray and memoryview are encoded like bytes."""
+        expected = json_dumps(self.DATA)
+        assert json_dumps(bytearray(self.DATA)) == expected
+        assert json_dumps(memoryview(self.DATA)) == expected
+
+    @pytest.mark.parametrize(
+        ("bytes_mode", "expected"),
+        [
+            ("base64", base64.b64encode(DATA).decode()),
+            ("base85", base64.b85encode(DATA).decode()),
+            ("hex", DATA.hex()),
+            ("latin-1", DATA.decode("latin-1")),
+        ],
+    )
+    def test_bytes_modes(self, bytes_mode: str, expected: str) -> None:
+        """Each bytes_mode encodes every bytes-like type, in both encoding modes."""
+        for value in (self.DATA, bytearray(self.DATA), memoryview(self.DATA)):
+            assert json.loads(json_dumps({"blob": value}, bytes_mode=bytes_mode)) == {"blob": expected}  # type: ignore[arg-type]
+            assert json.loads(json_dumps([value], mode="precompute", bytes_mode=bytes_mode)) == [expected]  # type: ignore[arg-type]
+
+    def test_memoryview_slice(self) -> None:
+        """A memoryview slice is encoded without copying the whole buffer."""
+        assert json_dumps(memoryview(b"abcdef")[2:4], bytes_mode="hex") == '"6364"'
+
+    def test_type_handlers_override_bytes_mode(self) -> None:
+        """Explicit per-call handlers take precedence over bytes_mode."""
+        assert json_dumps(b"ab", {bytes: len}, bytes_mode="base64") == "2"
+
+    def test_unknown_bytes_mode_raises(self) -> None:
+        """An unknown bytes_mode raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown bytes_mode: base32"):
+            json_dumps(b"", bytes_mode="base32")  # type: ignore[arg-type]
+
+    def test_json_dumps_bytes(self) -> None:
+        """json_dumps_bytes returns UTF-8 encoded json_dumps output."""
+        data = {"name": "caf\u00e9", "blob": b"\x01"}
+        assert json_dumps_bytes(data, bytes_mode="base64") == json_dumps(data, bytes_mode="base64").encode()
+        assert json_dumps_bytes(data, ensure_ascii=False, bytes_mode="hex") == '{"name": "caf\u00e9", "blob": "01"}'.encode()
+
+
+class TestJsonDumpsBackend:
+    """Tests for the optional orjson backend."""
+
+    COMPACT: ClassVar[dict[str, object]] = {"ensure_ascii": False, "separators": (",", ":")}
+
+    FLOATS: ClassVar[list[float]] = [1.5, 0.1, -0.0, float("nan"), float("inf"), float("-inf"), 1e16, 1e-05, 2.5e-07]
+
+    @staticmethod
+    def payload() -> dict[str, object]:
+        """Build a float-free payload mixing native, registered and dataclass values, which orjson encodes."""
+        return {
+            "text": 'caf\u00e9 \u2028 \x00 "q" \\',
+            "numbers": [0, -1, 2**63 - 1],
+            "nested": {"empty": {}, "list": [], "tuple": (1, 2), "none": None, "flag": True},
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "at": datetime(2024, 1, 15, 10, 30, 0, 123456),
+            "day": date(2024, 1, 15),
+            "price": Decimal("9.99"),
+            "color": _Color.RED,
+            "level": _Level.HIGH,
+            "point": _Point(1, 2),
+            "tags": {"a"},
+            "blob": b"\x01",
+        }
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"ensure_ascii": False, "separators": (",", ":")},
+            {"ensure_ascii": False, "separators": (",", ":"), "sort_keys": True},
+            {"ensure_ascii": False, "indent": 2},
+            {"ensure_ascii": False, "indent": 2, "sort_keys": True},
+        ],
+    )
+    def test_output_matches_stdlib(self, options: dict[str, object]) -> None:
+        """Supported option combinations produce the same text as the json module."""
+        pytest.importorskip("orjson")
+        payload = self.payload()
+        expected = json_dumps(payload, **options)
+        assert json_dumps(payload, backend="auto", **options) == expected
+        assert json_dumps_bytes(payload, backend="auto", **options) == expected.encode()
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {"ensure_ascii": False, "separators": (",", ":")},
+            {"ensure_ascii": False, "indent": 2},
+        ],
+    )
+    def test_floats_match_stdlib(self, options: dict[str, object]) -> None:
+        """NaN, infinity and exponent floats are written exactly as the json module writes them."""
+        pytest.importorskip("orjson")
+        payloads: list[object] = [
+            self.FLOATS,
+            {"nested": {"values": self.FLOATS, "tuple": (1e16,)}, "id": UUID(int=1)},
+            {"enum": _FloatLevel.TINY},
+        ]
+        for payload in payloads:
+            assert json_dumps(payload, backend="auto", **options) == json_dumps(payload, **options)
+
+    def test_handler_floats_match_stdlib(self) -> None:
+        """Floats produced by handlers are written exactly as the json module writes them."""
+        pytest.importorskip("orjson")
+        payload = [Decimal("1E-5"), Decimal("Infinity")]
+        expected = json_dumps(payload, {Decimal: float}, **self.COMPACT)  # type: ignore[arg-type]
+        assert expected == "[1e-05,Infinity]"
+        assert json_dumps(payload, {Decimal: float}, backend="auto", **self.COMPACT) == expected  # type: ignore[arg-type]
+
+    def test_boundary_floats_match_stdlib(self) -> None:
+        """Floats around the exponent-form thresholds are written exactly as the json module writes them."""
+        pytest.importorskip("orjson")
+        boundary = [1e-4, 9.999e-5, 1.0001e-4, 9999999999999998.0, 1e16, 1.0000000000000002e16, 5e-324, 1.7976931348623157e308]
+        for value in [*boundary, *(-value for value in boundary), 0.0, -0.0, 0.1 + 0.2, 123456.789, 2.0**53]:
+            for payload in (value, [value], {"v": value}):
+                assert json_dumps(payload, backend="auto", **self.COMPACT) == json_dumps(payload, **self.COMPACT)  # type: ignore[arg-type]
+
+    def test_orjson_is_used_only_without_mismatched_floats(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Payloads with ordinary floats go through orjson; NaN, infinity and exponent-form floats skip it."""
+        orjson = pytest.importorskip("orjson")
+        calls: list[object] = []
+
+        def dumps(obj: object, **kwargs: object) -> bytes:
+            calls.append(obj)
+            return orjson.dumps(obj, **kwargs)  # type: ignore[no-any-return]
+
+        spy = SimpleNamespace(**{name: getattr(orjson, name) for name in dir(orjson) if not name.startswith("_")})
+        spy.dumps = dumps
+        monkeypatch.setattr(json_utils, "_load_orjson", lambda: spy)
+        assert json_dumps({"a": [1, "x", 1.5, -0.0]}, backend="auto", **self.COMPACT) == '{"a":[1,"x",1.5,-0.0]}'  # type: ignore[arg-type]
+        assert len(calls) == 1
+        for value, expected in ((1e16, "1e+16"), (1e-05, "1e-05"), (float("nan"), "NaN"), (float("-inf"), "-Infinity")):
+            assert json_dumps({"a": [1.5, value]}, backend="auto", **self.COMPACT) == f'{{"a":[1.5,{expected}]}}'  # type: ignore[arg-type]
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"ensure_ascii": False},
+            {"ensure_ascii": False, "indent": 4},
+            {"ensure_ascii": False, "separators": (",", ":"), "allow_nan": False},
+        ],
+    )
+    def test_unsupported_options_use_stdlib(self, options: dict[str, object]) -> None:
+        """Options orjson cannot reproduce fall back to the json module."""
+        assert json_dumps([1e16, "\u00e9"], backend="auto", **options) == json_dumps([1e16, "\u00e9"], **options)
+
+    @pytest.mark.parametrize("value", [{1: "int key"}, 2**64, [_Point(1, 2), {2, 3}]])
+    def test_orjson_errors_fall_back(self, value: object) -> None:
+        """Values orjson rejects are encoded by the json module."""
+        assert json_dumps(value, backend="auto", **self.COMPACT) == json_dumps(value, **self.COMPACT)  # type: ignore[arg-type]
+
+    def test_unserializable_raises_type_error(self) -> None:
+        """Unknown types still raise the json module's TypeError."""
+        with pytest.raises(TypeError, match="not JSON serializable"):
+            json_dumps(object(), backend="auto", **self.COMPACT)  # type: ignore[arg-type]
+
+    def test_custom_enum_handler_is_respected(self) -> None:
+        """A per-call handler for a type orjson encodes natively disables the orjson path."""
+        result = json_dumps(_Color.RED, {_Color: lambda obj: obj.name}, backend="auto", **self.COMPACT)  # type: ignore[arg-type]
+        assert result == '"RED"'
+
+    def test_missing_orjson_falls_back(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without orjson installed, the json module is used."""
+        monkeypatch.setattr(json_utils, "_load_orjson", lambda: None)
+        assert json_dumps(1e16, backend="auto", **self.COMPACT) == "1e+16"  # type: ignore[arg-type]
+
+    def test_unknown_backend_raises(self) -> None:
+        """An unknown backend raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown backend: ujson"):
+            json_dumps({}, backend="ujson")  # type: ignore[arg-type]
+
+
+class TestJsonDumpStream:
+    """Tests for json_dump_stream and iter_json_chunks functions."""
+
+    def test_matches_json_dumps(self) -> None:
+        """Streamed output equals json_dumps output."""
+        data = {"id": UUID(int=1), "items": [Decimal("1.5"), {"when": date(2024, 1, 15)}], "n": None}
+        out = io.StringIO()
+        json_dump_stream(data, out)
+        assert out.getvalue() == json_dumps(data)
+        assert "".join(iter_json_chunks(data, indent=2)) == json_dumps(data, indent=2)
+
+    def test_generators_are_written_as_arrays(self) -> None:
+        """Generators and iterators, also nested and empty, become JSON arrays."""
+        data = {"rows": ({"n": i} for i in range(3)), "empty": iter([]), "map": map(str, [1, 2])}
+        assert "".join(iter_json_chunks(data)) == '{"rows": [{"n": 0}, {"n": 1}, {"n": 2}], "empty": [], "map": ["1", "2"]}'
+        assert "".join(iter_json_chunks(x for x in [1, 2])) == "[1, 2]"
+
+    def test_generator_is_not_materialized(self) -> None:
+        """Chunks are produced while the generator is still being consumed."""
+        produced: list[int] = []
+
+        def rows() -> Iterator[str]:
+            for i in range(1000):
+                produced.append(i)
+                yield "x" * 10
+
+        chunks = iter_json_chunks(rows(), chunk_size=100)
+        next(chunks)
+        assert len(produced) < 20
+
+    def test_chunk_size(self) -> None:
+        """All chunks but the last have at least chunk_size characters."""
+        chunks = list(iter_json_chunks(list(range(1000)), chunk_size=50))
+        assert len(chunks) > 1
+        assert all(len(chunk) >= 50 for chunk in chunks[:-1])
+        assert json.loads("".join(chunks)) == list(range(1000))
+
+    def test_callback_with_encoding(self) -> None:
+        """A callable receives encoded byte chunks."""
+        received: list[bytes] = []
+        json_dump_stream({"name": "Zoë"}, received.append, encoding="utf-8", ensure_ascii=False)
+        assert b"".join(received).decode("utf-8") == '{"name": "Zoë"}'
+
+    def test_type_handlers(self) -> None:
+        """Per-call handlers apply to streamed output."""
+        assert "".join(iter_json_chunks([Decimal("1.5")], type_handlers={Decimal: float})) == "[1.5]"
+
+    def test_invalid_chunk_size_raises(self) -> None:
+        """Non-positive chunk_size raises ValueError."""
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            iter_json_chunks([], chunk_size=0)
+
+    def test_non_serializable_raises_type_error(self) -> None:
+        """Unsupported objects raise TypeError as in json_dumps."""
+        with pytest.raises(TypeError, match="not JSON serializable"):
+            "".join(iter_json_chunks([object()]))
+
+
+class TestJsonLines:
+    """Tests for json_dump_lines and iter_json_lines functions."""
+
+    RECORDS: ClassVar[list[dict[str, object]]] = [{"id": i, "name": f"n{i}", "tags": ["a", "b"] * i} for i in range(50)]
+
+    def test_dump_lines(self) -> None:
+        """Each record is written on its own line with extended types."""
+        out = io.StringIO()
+        json_dump_lines([{"amount": Decimal("1.5")}, {"id": UUID(int=1)}], out)
+        assert out.getvalue() == '{"amount": "1.5"}\n{"id": "00000000-0000-0000-0000-000000000001"}\n'
+
+    def test_round_trip_with_small_buffer(self) -> None:
+        """Lines spanning several read buffers are reassembled."""
+        out = io.BytesIO()
+        json_dump_lines(self.RECORDS, out, encoding="utf-8")
+        out.seek(0)
+        assert list(iter_json_lines(out, buffer_size=7)) == self.RECORDS
+
+    def test_skips_blank_lines_and_handles_crlf(self) -> None:
+        """Blank lines are ignored and CRLF line endings are accepted."""
+        source = io.BytesIO(b'{"a": 1}\r\n\r\n  \n[2]\n3')
+        assert list(iter_json_lines(source)) == [{"a": 1}, [2], 3]
+
+    def test_loads_kwargs(self) -> None:
+        """Extra arguments are passed to json.loads."""
+        source = io.BytesIO(b'{"price": 1.10}\n')
+        assert list(iter_json_lines(source, parse_float=Decimal)) == [{"price": Decimal("1.10")}]
+
+    def test_parallel_decoding_preserves_order(self) -> None:
+        """Decoding in a process pool yields records in input order."""
+        out = io.BytesIO()
+        json_dump_lines(self.RECORDS, out, encoding="utf-8")
+        out.seek(0)
+        assert list(iter_json_lines(out, workers=2, batch_size=3)) == self.RECORDS
+
+    def test_indent_raises(self) -> None:
+        """Indented output would break the one-record-per-line format."""
+        with pytest.raises(ValueError, match="indent is not supported"):
+            json_dump_lines([{}], io.StringIO(), indent=2)
+
+    def test_invalid_sizes_raise(self) -> None:
+        """Non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="must be positive"):
+            iter_json_lines(io.BytesIO(), buffer_size=0)
+
+
+class _Money:
+    def __init__(self, amount: str) -> None:
+        self.amount = Decimal(amount)
+
+
+class TestJsonLoads:
+    """Test json_loads and ExtendedJSONDecoder."""
+
+    def test_without_schema_matches_json_loads(self) -> None:
+        """Without a schema, json_loads behaves like json.loads."""
+        text = '{"a": [1, 2.5, "x", null, true]}'
+        assert json_loads(text) == json.loads(text)
+
+    def test_round_trip_with_schema(self) -> None:
+        """Types written by json_dumps are revived by field name."""
+        data = {
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "created_at": datetime(2023, 1, 1, 12, 0, 0),
+            "day": date(2023, 1, 2),
+            "price": Decimal("123.45"),
+            "path": Path("/tmp/x"),
+            "name": "test",
+        }
+        schema = {"id": UUID, "created_at": datetime, "day": date, "price": Decimal, "path": Path}
+        assert json_loads(json_dumps(data), schema) == data
+
+    def test_schema_applies_at_any_depth(self) -> None:
+        """Fields are matched inside nested objects and lists."""
+        text = '{"items": [{"at": "2023-01-01T00:00:00"}, {"at": null}], "meta": {"at": "2024-05-06T07:08:09"}}'
+        result = json_loads(text, {"at": datetime})
+        assert result["items"][0]["at"] == datetime(2023, 1, 1)
+        assert result["items"][1]["at"] is None
+        assert result["meta"]["at"] == datetime(2024, 5, 6, 7, 8, 9)
+
+    def test_decimal_from_number(self) -> None:
+        """Numeric Decimal fields are converted without binary float noise."""
+        assert json_loads('{"price": 0.1}', {"price": Decimal})["price"] == Decimal("0.1")
+
+    def test_use_decimal(self) -> None:
+        """use_decimal parses every float as Decimal."""
+        result = json_loads('{"a": 1.10, "b": [2.5], "c": 3}', use_decimal=True)
+        assert result == {"a": Decimal("1.10"), "b": [Decimal("2.5")], "c": 3}
+        assert isinstance(result["c"], int)
+
+    def test_user_object_hook_is_chained(self) -> None:
+        """A caller's object_hook runs after schema conversion."""
+        result = json_loads('{"day": "2023-01-02"}', {"day": date}, object_hook=lambda obj: obj["day"])
+        assert result == date(2023, 1, 2)
+
+    def test_object_pairs_hook_with_schema_raises(self) -> None:
+        """A schema cannot be combined with object_pairs_hook."""
+        with pytest.raises(ValueError, match="object_pairs_hook"):
+            json_loads("{}", {"day": date}, object_pairs_hook=dict)
+
+    def test_unregistered_type_raises(self) -> None:
+        """Schema types without a decoder are rejected up front."""
+        with pytest.raises(ValueError, match="No decoder registered for type: _Money"):
+            json_loads("{}", {"m": _Money})
+
+    def test_register_custom_type(self) -> None:
+        """Registered decoders are used for schema fields."""
+        ExtendedJSONDecoder.register(_Money, _Money)
+        result = json_loads('{"m": "9.99"}', {"m": _Money})
+        assert isinstance(result["m"], _Money)
+        assert result["m"].amount == Decimal("9.99")
+
+    def test_register_builtin_type_raises(self) -> None:
+        """Built-in JSON types cannot be overridden."""
+        with pytest.raises(ValueError, match="Cannot override built-in JSON type: str"):
+            ExtendedJSONDecoder.register(str, str)
+
+    def test_decoder_usable_as_cls(self) -> None:
+        """ExtendedJSONDecoder works as json.loads cls."""
+        result = json.loads('{"id": "12345678-1234-5678-1234-567812345678"}', cls=ExtendedJSONDecoder, schema={"id": UUID})
+        assert result["id"] == UUID("12345678-1234-5678-1234-567812345678")